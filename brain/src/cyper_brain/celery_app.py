@@ -22,4 +22,4 @@ app.conf.update(
 )
 
 # Auto-discover tasks
-app.autodiscover_tasks(['cyper_brain.tasks'])
+app.autodiscover_tasks(['cyper_brain.tasks', 'cyper_brain.notifications'])
@@ -7,27 +7,202 @@ Following TDD - tests in test_email_notifications.py
 """
 
 import os
+import re
+import hmac
 import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from enum import Enum
-from jinja2 import Template
+from functools import lru_cache
+from urllib.parse import urlencode
+from jinja2 import Environment
+from markupsafe import escape
+
+from .bloom import BloomFilter
+from ..tools.rate_limit import TokenBucket
 
 # SendGrid import
 try:
     from sendgrid import SendGridAPIClient
-    from sendgrid.helpers.mail import Mail, Email, To, Content
+    from sendgrid.helpers.mail import Mail, Email, To, Content, Personalization, Substitution
 except ImportError:
     SendGridAPIClient = None  # Allow tests to run without SendGrid
 
 logger = logging.getLogger(__name__)
 
+# One bucket per process so every EmailService (and worker task) shares the cap
+_default_limiter: Optional[TokenBucket] = None
+_default_limiter_lock = threading.Lock()
+
+
+def _get_default_limiter() -> TokenBucket:
+    """Process-wide SendGrid limiter, sized from SENDGRID_RPS"""
+    global _default_limiter
+    if _default_limiter is None:
+        with _default_limiter_lock:
+            if _default_limiter is None:
+                _default_limiter = TokenBucket(
+                    rate=int(os.getenv("SENDGRID_RPS", "500")),
+                    capacity=int(os.getenv("SENDGRID_BURST", "1000"))
+                )
+    return _default_limiter
+
+
+@lru_cache(maxsize=8)
+def _get_client(api_key: str) -> "SendGridAPIClient":
+    """One SendGrid client (and connection pool) per API key per process"""
+    return SendGridAPIClient(api_key)
+
 
 class EmailDeliveryFailed(Exception):
     """Raised when email delivery fails"""
     pass
 
 
+# Email bodies, compiled once below rather than on every render
+_TEMPLATE_SOURCES = {
+    "scan_complete": """
+        <html>
+        <body style="font-family: Arial, sans-serif;">
+            <h2>Scan Complete: {{ target }}</h2>
+            <p>Your security scan has finished.</p>
+            <div style="background: #f5f5f5; padding: 15px; margin: 20px 0;">
+                <strong>Findings:</strong> {{ findings_count }}<br>
+                {% if critical_count %}
+                <span style="color: #d32f2f;"><strong>Critical:</strong> {{ critical_count }}</span><br>
+                {% endif %}
+            </div>
+            <p><a href="{{ scan_url }}" style="background: #2196F3; color: white; padding: 10px 20px; text-decoration: none; border-radius: 4px;">View Report</a></p>
+            <p style="color: #666; font-size: 12px; margin-top: 40px;">
+                <a href="{{ unsubscribe_url }}">Unsubscribe</a> from scan notifications
+            </p>
+        </body>
+        </html>
+    """,
+    "critical_finding": """
+        <html>
+        <body style="font-family: Arial, sans-serif;">
+            <div style="background: #d32f2f; color: white; padding: 15px;">
+                <h2 style="margin: 0;">🚨 CRITICAL Security Finding Detected</h2>
+            </div>
+            <div style="padding: 20px;">
+                <h3>{{ title }}</h3>
+                <p><strong>Severity:</strong> <span style="color: #d32f2f;">{{ severity|upper }}</span></p>
+                <p><strong>CVSS Score:</strong> {{ cvss_score }}/10</p>
+                <p><strong>Affected Target:</strong> {{ target }}</p>
+                <div style="background: #fff3cd; padding: 15px; margin: 20px 0;">
+                    <strong>Recommendation:</strong><br>
+                    {{ recommendation }}
+                </div>
+                <p><a href="{{ finding_url }}" style="background: #d32f2f; color: white; padding: 10px 20px; text-decoration: none; border-radius: 4px;">View Details</a></p>
+            </div>
+        </body>
+        </html>
+    """,
+    "payment_success": """
+        <html>
+        <body style="font-family: Arial, sans-serif;">
+            <h2>Payment Received - Thank You!</h2>
+            <p>Your payment has been processed successfully.</p>
+            <div style="background: #f5f5f5; padding: 15px; margin: 20px 0;">
+                <strong>Amount:</strong> ${{ amount }}<br>
+                <strong>Plan:</strong> {{ plan }}<br>
+                <strong>Period:</strong> {{ period }}
+            </div>
+            <p><a href="{{ invoice_url }}">Download Invoice</a></p>
+        </body>
+        </html>
+    """,
+    "payment_failed": """
+        <html>
+        <body style="font-family: Arial, sans-serif;">
+            <h2>Payment Failed - Action Required</h2>
+            <p>We were unable to process your payment.</p>
+            <div style="background: #ffebee; padding: 15px; margin: 20px 0;">
+                <strong>Reason:</strong> {{ reason }}
+            </div>
+            <p>Please update your payment method to continue using Pro features.</p>
+            <p><a href="{{ update_payment_url }}" style="background: #2196F3; color: white; padding: 10px 20px; text-decoration: none; border-radius: 4px;">Update Payment Method</a></p>
+        </body>
+        </html>
+    """,
+    "trial_ending": """
+        <html>
+        <body style="font-family: Arial, sans-serif;">
+            <h2>Your Trial is Ending Soon</h2>
+            <p>You have <strong>{{ days_remaining }} days</strong> left in your free trial.</p>
+            <p>Upgrade now to continue enjoying Pro features:</p>
+            <ul>
+                <li>1,000 scans per month</li>
+                <li>Advanced reports</li>
+                <li>Priority support</li>
+            </ul>
+            <p><a href="{{ upgrade_url }}" style="background: #4CAF50; color: white; padding: 10px 20px; text-decoration: none; border-radius: 4px;">Upgrade to Pro - $99/month</a></p>
+        </body>
+        </html>
+    """,
+    "trial_expired": """
+        <html>
+        <body style="font-family: Arial, sans-serif;">
+            <h2>Your Trial Has Expired</h2>
+            <p>Your free trial has ended. You've been moved to the Free plan.</p>
+            <p><strong>Free Plan Limits:</strong></p>
+            <ul>
+                <li>100 scans per month</li>
+                <li>Basic reports</li>
+            </ul>
+            <p>Upgrade to Pro to unlock more scans and features:</p>
+            <p><a href="{{ upgrade_url }}" style="background: #4CAF50; color: white; padding: 10px 20px; text-decoration: none; border-radius: 4px;">Upgrade Now</a></p>
+        </body>
+        </html>
+    """
+}
+
+# Sources never change at runtime, so skip the reload checks; autoescape keeps
+# finding titles and other scan-derived values from injecting markup
+_ENV = Environment(cache_size=-1, auto_reload=False, autoescape=True)
+
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class _FragmentTemplate:
+    """
+    Template made only of literal text and plain {{ name }} slots
+    
+    Rendering fills the slots between precomputed literals and joins once,
+    skipping Jinja's per-render context setup. Values are escaped exactly
+    as the autoescaping Environment would.
+    """
+    
+    __slots__ = ("literals", "keys")
+    
+    def __init__(self, literals: Tuple[str, ...], keys: Tuple[str, ...]):
+        self.literals = literals
+        self.keys = keys
+    
+    def render(self, **kwargs) -> str:
+        parts = [None] * (len(self.literals) + len(self.keys))
+        parts[0::2] = self.literals
+        parts[1::2] = [escape(kwargs.get(key, "")) for key in self.keys]
+        return "".join(parts)
+
+
+def _compile_template(source: str):
+    """Use the fragment fast path when the template has no tags or filters"""
+    pieces = _PLACEHOLDER_RE.split(source)
+    literals = tuple(pieces[0::2])
+    if any(marker in literal for literal in literals for marker in ("{{", "{%", "{#")):
+        return _ENV.from_string(source)
+    return _FragmentTemplate(literals, tuple(pieces[1::2]))
+
+
+_TEMPLATES = {name: _compile_template(source) for name, source in _TEMPLATE_SOURCES.items()}
+
+
 class EmailTemplate(Enum):
     """Email template definitions"""
     
@@ -40,129 +215,75 @@ class EmailTemplate(Enum):
     
     def render(self, **kwargs) -> str:
         """Render template with data"""
-        templates = {
-            "scan_complete": """
-                <html>
-                <body style="font-family: Arial, sans-serif;">
-                    <h2>Scan Complete: {{ target }}</h2>
-                    <p>Your security scan has finished.</p>
-                    <div style="background: #f5f5f5; padding: 15px; margin: 20px 0;">
-                        <strong>Findings:</strong> {{ findings_count }}<br>
-                        {% if critical_count %}
-                        <span style="color: #d32f2f;"><strong>Critical:</strong> {{ critical_count }}</span><br>
-                        {% endif %}
-                    </div>
-                    <p><a href="{{ scan_url }}" style="background: #2196F3; color: white; padding: 10px 20px; text-decoration: none; border-radius: 4px;">View Report</a></p>
-                    <p style="color: #666; font-size: 12px; margin-top: 40px;">
-                        <a href="{{ unsubscribe_url }}">Unsubscribe</a> from scan notifications
-                    </p>
-                </body>
-                </html>
-            """,
-            "critical_finding": """
-                <html>
-                <body style="font-family: Arial, sans-serif;">
-                    <div style="background: #d32f2f; color: white; padding: 15px;">
-                        <h2 style="margin: 0;">🚨 CRITICAL Security Finding Detected</h2>
-                    </div>
-                    <div style="padding: 20px;">
-                        <h3>{{ title }}</h3>
-                        <p><strong>Severity:</strong> <span style="color: #d32f2f;">{{ severity|upper }}</span></p>
-                        <p><strong>CVSS Score:</strong> {{ cvss_score }}/10</p>
-                        <p><strong>Affected Target:</strong> {{ target }}</p>
-                        <div style="background: #fff3cd; padding: 15px; margin: 20px 0;">
-                            <strong>Recommendation:</strong><br>
-                            {{ recommendation }}
-                        </div>
-                        <p><a href="{{ finding_url }}" style="background: #d32f2f; color: white; padding: 10px 20px; text-decoration: none; border-radius: 4px;">View Details</a></p>
-                    </div>
-                </body>
-                </html>
-            """,
-            "payment_success": """
-                <html>
-                <body style="font-family: Arial, sans-serif;">
-                    <h2>Payment Received - Thank You!</h2>
-                    <p>Your payment has been processed successfully.</p>
-                    <div style="background: #f5f5f5; padding: 15px; margin: 20px 0;">
-                        <strong>Amount:</strong> ${{ amount }}<br>
-                        <strong>Plan:</strong> {{ plan }}<br>
-                        <strong>Period:</strong> {{ period }}
-                    </div>
-                    <p><a href="{{ invoice_url }}">Download Invoice</a></p>
-                </body>
-                </html>
-            """,
-            "payment_failed": """
-                <html>
-                <body style="font-family: Arial, sans-serif;">
-                    <h2>Payment Failed - Action Required</h2>
-                    <p>We were unable to process your payment.</p>
-                    <div style="background: #ffebee; padding: 15px; margin: 20px 0;">
-                        <strong>Reason:</strong> {{ reason }}
-                    </div>
-                    <p>Please update your payment method to continue using Pro features.</p>
-                    <p><a href="{{ update_payment_url }}" style="background: #2196F3; color: white; padding: 10px 20px; text-decoration: none; border-radius: 4px;">Update Payment Method</a></p>
-                </body>
-                </html>
-            """,
-            "trial_ending": """
-                <html>
-                <body style="font-family: Arial, sans-serif;">
-                    <h2>Your Trial is Ending Soon</h2>
-                    <p>You have <strong>{{ days_remaining }} days</strong> left in your free trial.</p>
-                    <p>Upgrade now to continue enjoying Pro features:</p>
-                    <ul>
-                        <li>1,000 scans per month</li>
-                        <li>Advanced reports</li>
-                        <li>Priority support</li>
-                    </ul>
-                    <p><a href="{{ upgrade_url }}" style="background: #4CAF50; color: white; padding: 10px 20px; text-decoration: none; border-radius: 4px;">Upgrade to Pro - $99/month</a></p>
-                </body>
-                </html>
-            """,
-            "trial_expired": """
-                <html>
-                <body style="font-family: Arial, sans-serif;">
-                    <h2>Your Trial Has Expired</h2>
-                    <p>Your free trial has ended. You've been moved to the Free plan.</p>
-                    <p><strong>Free Plan Limits:</strong></p>
-                    <ul>
-                        <li>100 scans per month</li>
-                        <li>Basic reports</li>
-                    </ul>
-                    <p>Upgrade to Pro to unlock more scans and features:</p>
-                    <p><a href="{{ upgrade_url }}" style="background: #4CAF50; color: white; padding: 10px 20px; text-decoration: none; border-radius: 4px;">Upgrade Now</a></p>
-                </body>
-                </html>
-            """
-        }
-        
-        template_str = templates.get(self.value, "")
-        template = Template(template_str)
-        return template.render(**kwargs)
+        return _TEMPLATES[self.value].render(**kwargs)
 
 
 class EmailService:
     """
     Email notification service
     
-    Handles all email delivery using SendGrid.
+    Handles all email delivery using SendGrid. With ``async_mode`` enabled,
+    ``send_email`` only enqueues a Celery task and a worker does the SendGrid call.
     """
     
-    def __init__(self, api_key: Optional[str] = None, from_email: Optional[str] = None):
+    # One SendGrid request per this many recipients in send_batch
+    BATCH_SIZE = 100
+    
+    # How many 429s a single send waits out, and the longest wait honoured
+    RATE_LIMIT_RETRIES = 3
+    MAX_RATE_LIMIT_WAIT = 60.0
+    
+    # Subscription lookups are memoised this long, for at most this many pairs
+    SUBSCRIPTION_CACHE_TTL = 60.0
+    SUBSCRIPTION_CACHE_SIZE = 10_000
+    
+    # Preference type recording a user's opt-out from all non-billing email
+    ALL_EMAILS = "all"
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        from_email: Optional[str] = None,
+        async_mode: Optional[bool] = None,
+        limiter: Optional[TokenBucket] = None
+    ):
         """
         Initialize email service
         
         Args:
             api_key: SendGrid API key (or from SENDGRID_API_KEY env)
             from_email: Sender email address
+            async_mode: Queue emails for a Celery worker instead of sending inline
+                (or from EMAIL_ASYNC env)
+            limiter: Token bucket for SendGrid calls (defaults to a process-wide one)
+
+        Raises:
+            ValueError: If UNSUBSCRIBE_SECRET is unset and DEBUG_MODE is off
         """
         self.api_key = api_key or os.getenv("SENDGRID_API_KEY")
         self.from_email = from_email or os.getenv("FROM_EMAIL", "noreply@cypersecurity.com")
+        if async_mode is None:
+            async_mode = os.getenv("EMAIL_ASYNC", "").lower() in ("1", "true", "yes")
+        self.async_mode = async_mode
+        self.limiter = limiter or _get_default_limiter()
+        
+        unsubscribe_secret = os.getenv("UNSUBSCRIBE_SECRET")
+        if not unsubscribe_secret:
+            # A per-process key would silently break every link already sent
+            if os.getenv("DEBUG_MODE", "").lower() not in ("1", "true", "yes"):
+                raise ValueError("UNSUBSCRIBE_SECRET required")
+            logger.warning("UNSUBSCRIBE_SECRET not set - unsubscribe links only valid for this process")
+            unsubscribe_secret = secrets.token_hex(32)
+        # Keyed once; each link signs a copy instead of re-keying SHA-256
+        self._unsubscribe_hmac = hmac.new(unsubscribe_secret.encode(), digestmod="sha256")
+        # (email, email_type) -> (subscribed, expires_at), oldest first
+        self._subscription_cache: "OrderedDict[Tuple[str, str], Tuple[bool, float]]" = OrderedDict()
+        self._subscription_lock = threading.Lock()
+        # Users opted out of all email; None until load_unsubscribed() is called
+        self._unsubscribed_filter: Optional[BloomFilter] = None
         
         if SendGridAPIClient and self.api_key:
-            self.client = SendGridAPIClient(self.api_key)
+            self.client = _get_client(self.api_key)
         else:
             self.client = None
             logger.warning("SendGrid not configured - emails will be logged only")
@@ -184,11 +305,14 @@ class EmailService:
             from_email: Override sender email
         
         Returns:
-            Dict with status and details
+            Dict with status and details ("queued" in async mode)
         
         Raises:
-            EmailDeliveryFailed: If delivery fails
+            EmailDeliveryFailed: If delivery (or enqueueing) fails
         """
+        if self.async_mode:
+            return self._enqueue(to, subject, html_content, from_email)
+        
         try:
             if not self.client:
                 # Log only mode (for development/testing)
@@ -202,7 +326,7 @@ class EmailService:
                 html_content=html_content
             )
             
-            response = self.client.send(message)
+            response = self._send_limited(message)
             
             logger.info(f"Email sent to {to}: {subject}")
             
@@ -216,8 +340,67 @@ class EmailService:
             logger.error(f"Failed to send email to {to}: {e}")
             raise EmailDeliveryFailed(f"Email delivery failed: {e}")
     
+    def _send_limited(self, message: "Mail"):
+        """
+        Send through the token bucket, waiting out any 429 from SendGrid
+        
+        A 429 drains the bucket until the provider's reset time so other
+        senders in this process stop as well, then the send is retried.
+        """
+        for attempt in range(self.RATE_LIMIT_RETRIES + 1):
+            self.limiter.acquire()
+            try:
+                return self.client.send(message)
+            except Exception as e:
+                if getattr(e, "status_code", None) != 429 or attempt == self.RATE_LIMIT_RETRIES:
+                    raise
+                reset = self._rate_limit_reset(getattr(e, "headers", None))
+                logger.warning(f"SendGrid rate limit hit, pausing sends for {reset:.1f}s")
+                self.limiter.penalize(reset)
+    
+    def _rate_limit_reset(self, headers) -> float:
+        """Seconds to wait from Retry-After or X-RateLimit-Reset (epoch seconds)"""
+        headers = headers or {}
+        try:
+            retry_after = headers.get("Retry-After")
+            if retry_after is not None:
+                delay = float(retry_after)
+            else:
+                reset = headers.get("X-RateLimit-Reset")
+                delay = float(reset) - time.time() if reset is not None else 1.0
+        except (TypeError, ValueError):
+            delay = 1.0
+        return min(max(delay, 0.0), self.MAX_RATE_LIMIT_WAIT)
+    
+    def _enqueue(
+        self,
+        to: str,
+        subject: str,
+        html_content: str,
+        from_email: Optional[str] = None
+    ) -> Dict:
+        """Hand the email to the Celery worker pool"""
+        # Imported here: the task module imports this one
+        from .tasks import send_email_task
+        
+        try:
+            task = send_email_task.delay(
+                to=to,
+                subject=subject,
+                html_content=html_content,
+                from_email=from_email or self.from_email
+            )
+        except Exception as e:
+            logger.error(f"Failed to queue email to {to}: {e}")
+            raise EmailDeliveryFailed(f"Email queueing failed: {e}")
+        
+        return {"status": "queued", "to": to, "task_id": task.id}
+    
     def notify_scan_complete(self, user_email: str, scan_data: Dict):
         """Send scan completion notification"""
+        if self._opted_out(user_email):
+            return
+        
         # Check if user is subscribed
         if not self.is_subscribed(user_email, "scan_notifications"):
             logger.info(f"User {user_email} unsubscribed from scan notifications")
@@ -243,6 +426,9 @@ class EmailService:
         if finding.get("severity") != "critical":
             return
         
+        if self._opted_out(user_email):
+            return
+        
         html = EmailTemplate.CRITICAL_FINDING.render(
             title=finding.get("title", "Security Finding"),
             severity=finding.get("severity", "critical"),
@@ -291,6 +477,9 @@ class EmailService:
     
     def notify_trial_ending(self, user_email: str, days_remaining: int):
         """Send trial ending reminder"""
+        if self._opted_out(user_email):
+            return
+        
         html = EmailTemplate.TRIAL_ENDING.render(
             days_remaining=days_remaining,
             upgrade_url="https://app.cypersecurity.com/upgrade"
@@ -304,6 +493,9 @@ class EmailService:
     
     def notify_trial_expired(self, user_email: str):
         """Send trial expiration notification"""
+        if self._opted_out(user_email):
+            return
+        
         html = EmailTemplate.TRIAL_EXPIRED.render(
             upgrade_url="https://app.cypersecurity.com/upgrade"
         )
@@ -314,28 +506,179 @@ class EmailService:
             html_content=html
         )
     
-    def send_batch(self, recipients: List[str], subject: str, html_content: str):
-        """Send email to multiple recipients"""
-        for recipient in recipients:
+    def send_batch(
+        self,
+        recipients: List[str],
+        subject: str,
+        html_content: str,
+        substitutions: Optional[Dict[str, Dict[str, str]]] = None,
+        email_type: Optional[str] = None
+    ) -> Dict:
+        """
+        Send email to multiple recipients
+        
+        Recipients are grouped into one SendGrid request per BATCH_SIZE, each
+        recipient getting its own personalization so nobody sees the others.
+        
+        Args:
+            recipients: Recipient email addresses
+            subject: Email subject
+            html_content: HTML email content
+            substitutions: Optional per-recipient {tag: value} replacements
+            email_type: Skip recipients unsubscribed from this email type
+        
+        Returns:
+            Dict with sent and failed recipient counts
+        """
+        substitutions = substitutions or {}
+        sent = failed = 0
+        
+        if email_type:
+            self.preload_subscriptions(recipients, email_type)
+            recipients = [r for r in recipients if self.is_subscribed(r, email_type)]
+        
+        if self.async_mode or not self.client:
+            # Queued and log-only sends are already cheap per recipient
+            for recipient in recipients:
+                try:
+                    self.send_email(recipient, subject, html_content)
+                    sent += 1
+                except EmailDeliveryFailed as e:
+                    logger.error(f"Failed to send to {recipient}: {e}")
+                    failed += 1
+            return {"status": "sent", "sent": sent, "failed": failed}
+        
+        for start in range(0, len(recipients), self.BATCH_SIZE):
+            chunk = recipients[start:start + self.BATCH_SIZE]
+            message = self._build_batch_message(chunk, subject, html_content, substitutions)
             try:
-                self.send_email(recipient, subject, html_content)
-            except EmailDeliveryFailed as e:
-                logger.error(f"Failed to send to {recipient}: {e}")
-                continue
+                self._send_limited(message)
+                sent += len(chunk)
+            except Exception as e:
+                logger.error(f"Failed to send batch of {len(chunk)} emails: {e}")
+                failed += len(chunk)
+        
+        logger.info(f"Batch email sent to {sent} recipients: {subject}")
+        return {"status": "sent", "sent": sent, "failed": failed}
+    
+    def _build_batch_message(
+        self,
+        recipients: List[str],
+        subject: str,
+        html_content: str,
+        substitutions: Dict[str, Dict[str, str]]
+    ) -> "Mail":
+        """Build one Mail carrying a personalization per recipient"""
+        message = Mail(
+            from_email=self.from_email,
+            subject=subject,
+            html_content=html_content
+        )
+        for recipient in recipients:
+            personalization = Personalization()
+            personalization.add_to(To(recipient))
+            for key, value in substitutions.get(recipient, {}).items():
+                personalization.add_substitution(Substitution(key, value))
+            message.add_personalization(personalization)
+        return message
+    
+    def load_unsubscribed(self, user_emails: Iterable[str], capacity: int = 100_000):
+        """
+        Build the opt-out filter, typically once at worker startup
+        
+        Args:
+            user_emails: Emails of users unsubscribed from all email
+            capacity: Expected number of opted-out users
+        """
+        unsubscribed = BloomFilter(capacity=capacity, error_rate=0.001)
+        unsubscribed.update(user_emails)
+        self._unsubscribed_filter = unsubscribed
+    
+    def _opted_out(self, user_email: str) -> bool:
+        """
+        Kill-switch checked before any rendering or signing
+        
+        The Bloom filter clears almost every user in one probe; only
+        possible matches pay for the exact preference lookup.
+        """
+        if self._unsubscribed_filter is None or user_email not in self._unsubscribed_filter:
+            return False
+        
+        if self.is_subscribed(user_email, self.ALL_EMAILS):
+            return False  # Bloom false positive
+        
+        logger.info(f"User {user_email} unsubscribed from all emails")
+        return True
     
     def unsubscribe(self, user_id: str, email_type: str):
         """Mark user as unsubscribed from email type"""
         # In real implementation, update database
         # db.update_email_preferences(user_id, email_type, subscribed=False)
+        # Cached entries are keyed by email, so drop every entry for this type
+        with self._subscription_lock:
+            for key in [k for k in self._subscription_cache if k[1] == email_type]:
+                del self._subscription_cache[key]
         logger.info(f"User {user_id} unsubscribed from {email_type}")
     
     def is_subscribed(self, user_email: str, email_type: str) -> bool:
-        """Check if user is subscribed to email type"""
-        # In real implementation, check database
-        # return db.get_email_preference(user_email, email_type)
-        return True  # Default to subscribed
+        """Check if user is subscribed to email type (memoised for SUBSCRIPTION_CACHE_TTL)"""
+        key = (user_email, email_type)
+        now = time.monotonic()
+        
+        with self._subscription_lock:
+            cached = self._subscription_cache.get(key)
+            if cached is not None and cached[1] > now:
+                return cached[0]
+        
+        subscribed = self._load_subscriptions([user_email], email_type)[user_email]
+        self._cache_subscriptions({user_email: subscribed}, email_type)
+        return subscribed
+    
+    def preload_subscriptions(self, user_emails: List[str], email_type: str):
+        """Warm the subscription cache for a batch with a single lookup"""
+        now = time.monotonic()
+        with self._subscription_lock:
+            missing = [
+                email for email in dict.fromkeys(user_emails)
+                if (cached := self._subscription_cache.get((email, email_type))) is None
+                or cached[1] <= now
+            ]
+        
+        if missing:
+            self._cache_subscriptions(self._load_subscriptions(missing, email_type), email_type)
+    
+    def _load_subscriptions(self, user_emails: List[str], email_type: str) -> Dict[str, bool]:
+        """Fetch subscription flags for many users"""
+        # In real implementation, one bulk query
+        # return db.get_email_preferences_bulk(user_emails, email_type)
+        return {email: True for email in user_emails}  # Default to subscribed
+    
+    def _cache_subscriptions(self, subscriptions: Dict[str, bool], email_type: str):
+        """Store lookups, evicting the oldest entries past SUBSCRIPTION_CACHE_SIZE"""
+        expires_at = time.monotonic() + self.SUBSCRIPTION_CACHE_TTL
+        with self._subscription_lock:
+            for email, subscribed in subscriptions.items():
+                key = (email, email_type)
+                self._subscription_cache[key] = (subscribed, expires_at)
+                self._subscription_cache.move_to_end(key)
+            while len(self._subscription_cache) > self.SUBSCRIPTION_CACHE_SIZE:
+                self._subscription_cache.popitem(last=False)
     
     def _get_unsubscribe_url(self, user_email: str, email_type: str) -> str:
-        """Generate unsubscribe URL"""
-        # In production, generate secure token
-        return f"https://app.cypersecurity.com/unsubscribe?email={user_email}&type={email_type}"
+        """Generate signed unsubscribe URL"""
+        query = urlencode({
+            "email": user_email,
+            "type": email_type,
+            "token": self._unsubscribe_token(user_email, email_type)
+        })
+        return f"https://app.cypersecurity.com/unsubscribe?{query}"
+    
+    def _unsubscribe_token(self, user_email: str, email_type: str) -> str:
+        """HMAC-SHA256 over email and type, truncated to 128 bits"""
+        mac = self._unsubscribe_hmac.copy()
+        mac.update(f"{user_email}:{email_type}".encode())
+        return mac.digest()[:16].hex()
+    
+    def verify_unsubscribe_token(self, user_email: str, email_type: str, token: str) -> bool:
+        """Check an unsubscribe link's token in constant time"""
+        return hmac.compare_digest(self._unsubscribe_token(user_email, email_type), token)
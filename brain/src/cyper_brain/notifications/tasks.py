@@ -0,0 +1,47 @@
+"""
+Email delivery tasks
+
+EmailService.send_email enqueues these when async_mode is on, so callers
+never block on the SendGrid round-trip.
+"""
+
+import logging
+from typing import Dict, Optional
+
+from cyper_brain.celery_app import app
+from .email_service import EmailService, EmailDeliveryFailed
+
+logger = logging.getLogger(__name__)
+
+
+@app.task(
+    name='cyper_brain.notifications.send_email',
+    bind=True,
+    autoretry_for=(EmailDeliveryFailed,),
+    retry_backoff=True,
+    max_retries=5,
+    acks_late=True,
+)
+def send_email_task(
+    self,
+    to: str,
+    subject: str,
+    html_content: str,
+    from_email: Optional[str] = None
+) -> Dict:
+    """
+    Deliver one email through SendGrid from a worker.
+    
+    Args:
+        to: Recipient email address
+        subject: Email subject
+        html_content: HTML email content
+        from_email: Sender email address
+    
+    Returns:
+        dict: Delivery result from EmailService.send_email
+    """
+    logger.info(f"Delivering queued email to {to} (attempt {self.request.retries + 1})")
+    
+    service = EmailService(from_email=from_email, async_mode=False)
+    return service.send_email(to=to, subject=subject, html_content=html_content)
@@ -5,15 +5,32 @@ Implements web application vulnerability scanning.
 Following TDD - tests in test_zap_scanner.py
 """
 
+import asyncio
 import logging
+import re
 import time
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional, Dict
+from functools import lru_cache
+from typing import Any, IO, List, Optional, Dict, Union
 from urllib.parse import urlparse
 
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 logger = logging.getLogger(__name__)
 
+# orjson serialises result payloads several times faster than json
+try:
+    from orjson import dumps as _dumps
+except ImportError:
+    import json
+    
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
 # ZAP Python API
 try:
     from zapv2 import ZAPv2
@@ -21,6 +38,56 @@ except ImportError:
     ZAPv2 = None
     logger.warning("python-owasp-zap-v2.4 not installed - ZAP scanning disabled")
 
+if ZAPv2 is not None:
+    class _PooledZAPv2(ZAPv2):
+        """
+        ZAPv2 client whose API calls reuse keep-alive sessions
+
+        Stock ZAPv2 opens a new requests.Session per call, so every status
+        poll paid for a fresh connection to the daemon. Views go through
+        ``session``, which retries transient failures. Actions are GETs too
+        but start scans and change state, so they go through
+        ``action_session``, which never retries.
+        """
+        
+        def __init__(
+            self,
+            session: requests.Session,
+            action_session: requests.Session,
+            proxies: Optional[Dict[str, str]] = None,
+            apikey: Optional[str] = None,
+            validate_status_code: bool = False,
+        ):
+            super().__init__(
+                proxies=proxies, apikey=apikey, validate_status_code=validate_status_code
+            )
+            self._session = session
+            self._action_session = action_session
+            self._proxies = proxies
+            self._validate_status_code = validate_status_code
+        
+        def _request_api(self, url, query=None, method="GET", body=None):
+            # Same guard as ZAPv2: never send the API key anywhere but ZAP
+            if not url.startswith("http://zap/"):
+                raise ValueError(f"A non ZAP API url was specified {url}")
+            
+            session = self._action_session if "/action/" in url else self._session
+            response = session.request(
+                method, url, params=query, data=body, proxies=self._proxies, verify=False
+            )
+            
+            if self._validate_status_code and 300 <= response.status_code < 500:
+                raise Exception(
+                    "Non-successful status code returned from ZAP, which indicates a bad "
+                    f"request: {response.status_code}response: {response.text}"
+                )
+            if self._validate_status_code and response.status_code >= 500:
+                raise Exception(
+                    "Non-successful status code returned from ZAP, which indicates a ZAP "
+                    f"internal error: {response.status_code}response: {response.text}"
+                )
+            return response
+
 
 class OWASPCategory(Enum):
     """OWASP Top 10 2021 Categories"""
@@ -37,7 +104,53 @@ class OWASPCategory(Enum):
     UNKNOWN = "Unknown Category"
 
 
-@dataclass
+# Title keywords per category, in the order they win when a title matches several
+_OWASP_KEYWORDS = (
+    (OWASPCategory.A03_INJECTION,
+     ("sql injection", "xss", "cross site scripting", "command injection", "ldap injection")),
+    (OWASPCategory.A07_AUTH_FAILURES,
+     ("authentication", "authorization", "session", "access control")),
+    (OWASPCategory.A02_CRYPTO_FAILURES, ("crypto", "encryption", "ssl", "tls", "weak")),
+    (OWASPCategory.A05_SECURITY_MISCONFIG, ("misconfiguration", "default", "directory listing")),
+    (OWASPCategory.A10_SSRF, ("ssrf", "server side request")),
+)
+
+# One alternation with a named group per category, so a title is scanned once
+_OWASP_PATTERN = re.compile(
+    "|".join(
+        f"(?P<{category.name}>{'|'.join(map(re.escape, keywords))})"
+        for category, keywords in _OWASP_KEYWORDS
+    ),
+    re.IGNORECASE
+)
+_OWASP_PRIORITY = {category.name: rank for rank, (category, _) in enumerate(_OWASP_KEYWORDS)}
+
+
+# ZAP risk label -> integer rank, so filtering and sorting compare ints
+_RISK_RANK = {"Informational": 0, "Low": 1, "Medium": 2, "High": 3, "Critical": 4}
+_SEVERITY_RANK = {risk.lower(): rank for risk, rank in _RISK_RANK.items()}
+
+
+@lru_cache(maxsize=1024)
+def _owasp_category_for_title(title: str) -> OWASPCategory:
+    """Map an alert title to its OWASP category (alert names repeat across URLs)"""
+    best = None
+    for match in _OWASP_PATTERN.finditer(title):
+        if best is None or _OWASP_PRIORITY[match.lastgroup] < _OWASP_PRIORITY[best]:
+            best = match.lastgroup
+            if _OWASP_PRIORITY[best] == 0:
+                break
+    
+    if best is None:
+        return OWASPCategory.UNKNOWN
+    
+    category = OWASPCategory[best]
+    if category is OWASPCategory.A07_AUTH_FAILURES and "broken access" in title.lower():
+        return OWASPCategory.A01_BROKEN_ACCESS
+    return category
+
+
+@dataclass(slots=True)
 class Vulnerability:
     """Represents a web vulnerability"""
     title: str
@@ -51,36 +164,15 @@ class Vulnerability:
     cwe_id: Optional[str] = None
     wasc_id: Optional[str] = None
     confidence: str = "medium"
+    # Integer form of severity for sorting, e.g. sorted(vulns, key=attrgetter("risk_rank"))
+    risk_rank: int = field(init=False, repr=False, compare=False, default=0)
+    
+    def __post_init__(self):
+        self.risk_rank = _SEVERITY_RANK.get(self.severity, 0)
     
     def get_owasp_category(self) -> OWASPCategory:
         """Map vulnerability to OWASP Top 10 category"""
-        title_lower = self.title.lower()
-        
-        # Injection vulnerabilities
-        if any(term in title_lower for term in ["sql injection", "xss", "cross site scripting", 
-                                                  "command injection", "ldap injection"]):
-            return OWASPCategory.A03_INJECTION
-        
-        # Authentication/Authorization
-        if any(term in title_lower for term in ["authentication", "authorization", "session",
-                                                 "access control"]):
-            if "broken access" in title_lower:
-                return OWASPCategory.A01_BROKEN_ACCESS
-            return OWASPCategory.A07_AUTH_FAILURES
-        
-        # Cryptography
-        if any(term in title_lower for term in ["crypto", "encryption", "ssl", "tls", "weak"]):
-            return OWASPCategory.A02_CRYPTO_FAILURES
-        
-        # Misconfiguration
-        if any(term in title_lower for term in ["misconfiguration", "default", "directory listing"]):
-            return OWASPCategory.A05_SECURITY_MISCONFIG
-        
-        # SSRF
-        if "ssrf" in title_lower or "server side request" in title_lower:
-            return OWASPCategory.A10_SSRF
-        
-        return OWASPCategory.UNKNOWN
+        return _owasp_category_for_title(self.title)
     
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
@@ -115,6 +207,10 @@ class ZAPScanResult:
             "scan_duration": self.scan_duration,
             "pages_crawled": self.pages_crawled
         }
+    
+    def to_json_bytes(self) -> bytes:
+        """Serialize to_dict() as UTF-8 JSON for report upload"""
+        return _dumps(self.to_dict())
 
 
 class ZAPScanner:
@@ -125,6 +221,14 @@ class ZAPScanner:
     Requires ZAP to be running (typically on localhost:8080)
     """
     
+    # Status polling backs off from MIN to MAX interval while a scan runs
+    MIN_POLL_INTERVAL = 0.1
+    MAX_POLL_INTERVAL = 5.0
+    POLL_BACKOFF = 1.5
+    
+    # Read size when streaming reports to a file
+    REPORT_CHUNK_SIZE = 64 * 1024
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -145,14 +249,37 @@ class ZAPScanner:
         self.scan_timeout = scan_timeout
         
         if ZAPv2:
-            self.zap = ZAPv2(
+            proxies = {'http': zap_url, 'https': zap_url}
+            self.session = self._create_session()
+            self.zap = _PooledZAPv2(
+                self.session,
+                self._create_session(retry=False),
                 apikey=self.api_key,
-                proxies={'http': zap_url, 'https': zap_url}
+                proxies=proxies,
             )
         else:
             self.zap = None
             logger.error("ZAP client not available")
     
+    def _create_session(self, retry: bool = True) -> requests.Session:
+        """
+        Keep-alive session for ZAP API calls
+        
+        With ``retry`` transient failures are retried; leave it off for
+        anything that must not be sent twice.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.1) if retry else 0
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if self.api_key:
+            session.headers["X-ZAP-API-Key"] = self.api_key
+        return session
+    
     def _validate_url(self, url: str):
         """Validate target URL"""
         try:
@@ -185,19 +312,9 @@ class ZAPScanner:
     
     def wait_for_spider(self, scan_id: str, max_wait: int = 600):
         """Wait for spider to complete"""
-        start_time = time.time()
-        
-        while True:
-            if time.time() - start_time > max_wait:
-                raise TimeoutError(f"Spider timeout after {max_wait}s")
-            
-            status = int(self.zap.spider.status(scan_id))
-            logger.info(f"Spider progress: {status}%")
-            
-            if status >= 100:
-                break
-            
-            time.sleep(2)
+        self._poll_until_complete(
+            lambda: self.zap.spider.status(scan_id), max_wait, "Spider"
+        )
     
     def active_scan(
         self,
@@ -231,19 +348,41 @@ class ZAPScanner:
     
     def wait_for_active_scan(self, scan_id: str):
         """Wait for active scan to complete"""
-        start_time = time.time()
+        self._poll_until_complete(
+            lambda: self.zap.ascan.status(scan_id), self.scan_timeout, "Active scan"
+        )
+    
+    def _poll_until_complete(
+        self,
+        get_status,
+        max_wait: float,
+        label: str
+    ):
+        """
+        Poll a ZAP progress percentage until it reaches 100
+        
+        The sleep between polls starts at MIN_POLL_INTERVAL and grows by
+        POLL_BACKOFF up to MAX_POLL_INTERVAL, so short scans finish promptly
+        and long ones don't hammer the daemon.
+        
+        Raises:
+            TimeoutError: If the scan is still running after max_wait seconds
+        """
+        start_time = time.monotonic()
+        delay = self.MIN_POLL_INTERVAL
         
         while True:
-            if time.time() - start_time > self.scan_timeout:
-                raise TimeoutError(f"Scan timeout after {self.scan_timeout}s")
-            
-            status = int(self.zap.ascan.status(scan_id))
-            logger.info(f"Active scan progress: {status}%")
+            status = int(get_status())
+            logger.info(f"{label} progress: {status}%")
             
             if status >= 100:
-                break
+                return
             
-            time.sleep(5)
+            if time.monotonic() - start_time > max_wait:
+                raise TimeoutError(f"{label} timeout after {max_wait}s")
+            
+            time.sleep(delay)
+            delay = min(delay * self.POLL_BACKOFF, self.MAX_POLL_INTERVAL)
     
     def get_vulnerabilities(self, min_risk: str = "Low") -> List[Vulnerability]:
         """
@@ -258,36 +397,31 @@ class ZAPScanner:
         if not self.zap:
             return []
         
-        alerts = self.zap.core.alerts()
-        vulnerabilities = []
-        
-        risk_levels = ["Informational", "Low", "Medium", "High"]
-        min_risk_index = risk_levels.index(min_risk) if min_risk in risk_levels else 0
-        
-        for alert in alerts:
-            risk = alert.get("risk", "Low")
-            
-            # Filter by risk level
-            if risk_levels.index(risk) < min_risk_index:
-                continue
-            
-            vuln = Vulnerability(
-                title=alert.get("alert", "Unknown"),
-                severity=risk.lower(),
-                description=alert.get("description", ""),
-                url=alert.get("url", ""),
-                parameter=alert.get("param"),
-                attack=alert.get("attack"),
-                evidence=alert.get("evidence"),
-                solution=alert.get("solution"),
-                cwe_id=alert.get("cweid"),
-                wasc_id=alert.get("wascid"),
-                confidence=alert.get("confidence", "Medium").lower()
+        return self._alerts_to_vulnerabilities(self.zap.core.alerts(), min_risk)
+    
+    @staticmethod
+    def _alerts_to_vulnerabilities(alerts: List[Dict], min_risk: str = "Low") -> List[Vulnerability]:
+        """Convert raw ZAP alert dicts, dropping those below min_risk"""
+        threshold = _RISK_RANK.get(min_risk, 0)
+        
+        # Real scans return thousands of alerts; build them in one comprehension
+        return [
+            Vulnerability(
+                alert.get("alert", "Unknown"),
+                risk.lower(),
+                alert.get("description", ""),
+                alert.get("url", ""),
+                alert.get("param"),
+                alert.get("attack"),
+                alert.get("evidence"),
+                alert.get("solution"),
+                alert.get("cweid"),
+                alert.get("wascid"),
+                alert.get("confidence", "Medium").lower()
             )
-            
-            vulnerabilities.append(vuln)
-        
-        return vulnerabilities
+            for alert in alerts
+            if _RISK_RANK.get(risk := alert.get("risk", "Low"), 0) >= threshold
+        ]
     
     def scan(self, target_url: str, spider_first: bool = True) -> ZAPScanResult:
         """
@@ -333,9 +467,156 @@ class ZAPScanner:
         
         return result
     
-    def generate_html_report(self) -> str:
-        """Generate HTML vulnerability report"""
-        if not self.zap:
-            return ""
+    async def scan_async(
+        self,
+        target_url: str,
+        spider_first: bool = True,
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> ZAPScanResult:
+        """
+        Perform complete scan without blocking the event loop
+        
+        Talks to the ZAP REST API directly so many targets can be in flight
+        at once. Alerts and crawled URLs are scoped to target_url, since
+        other scans may be running in the same ZAP instance.
+        
+        Args:
+            target_url: URL to scan
+            spider_first: Whether to spider before active scan
+            session: Shared aiohttp session (one is created if omitted)
+        
+        Returns:
+            ZAPScanResult with vulnerabilities
+        """
+        self._validate_url(target_url)
+        
+        if session is None:
+            async with self._api_session() as session:
+                return await self.scan_async(target_url, spider_first, session)
+        
+        start_time = time.time()
+        logger.info(f"Starting ZAP scan of {target_url}")
+        
+        pages_crawled = 0
+        if spider_first:
+            spider = await self._api_get(session, "/JSON/spider/action/scan/", url=target_url)
+            await self._poll_until_complete_async(
+                session, "/JSON/spider/view/status/", spider["scan"], 600, "Spider"
+            )
+            urls = await self._api_get(session, "/JSON/core/view/urls/", baseurl=target_url)
+            pages_crawled = len(urls.get("urls", []))
+        
+        ascan = await self._api_get(session, "/JSON/ascan/action/scan/", url=target_url)
+        await self._poll_until_complete_async(
+            session, "/JSON/ascan/view/status/", ascan["scan"], self.scan_timeout, "Active scan"
+        )
+        
+        alerts = await self._api_get(session, "/JSON/core/view/alerts/", baseurl=target_url)
+        vulnerabilities = self._alerts_to_vulnerabilities(alerts.get("alerts", []))
+        
+        duration = time.time() - start_time
+        logger.info(f"Scan of {target_url} complete: {len(vulnerabilities)} vulnerabilities found in {duration:.1f}s")
+        
+        return ZAPScanResult(
+            target=target_url,
+            vulnerabilities=vulnerabilities,
+            scan_duration=duration,
+            pages_crawled=pages_crawled
+        )
+    
+    async def scan_many(self, targets: List[str], concurrency: int = 8) -> List[ZAPScanResult]:
+        """
+        Scan several targets concurrently
+        
+        Args:
+            targets: URLs to scan
+            concurrency: Maximum targets in flight at once
         
-        return self.zap.core.htmlreport()
+        Returns:
+            One ZAPScanResult per target, in input order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async with self._api_session(limit=concurrency * 2) as session:
+            async def scan_one(target_url: str) -> ZAPScanResult:
+                async with semaphore:
+                    return await self.scan_async(target_url, session=session)
+            
+            return await asyncio.gather(*(scan_one(target) for target in targets))
+    
+    def scan_targets(self, targets: List[str], concurrency: int = 8) -> List[ZAPScanResult]:
+        """Blocking wrapper around scan_many for synchronous callers"""
+        return asyncio.run(self.scan_many(targets, concurrency))
+    
+    def _api_session(self, limit: int = 16) -> aiohttp.ClientSession:
+        """aiohttp session for the ZAP REST API"""
+        headers = {"X-ZAP-API-Key": self.api_key} if self.api_key else {}
+        return aiohttp.ClientSession(
+            base_url=self.zap_url,
+            headers=headers,
+            connector=aiohttp.TCPConnector(limit=limit),
+            timeout=aiohttp.ClientTimeout(total=60)
+        )
+    
+    async def _api_get(self, session: aiohttp.ClientSession, path: str, **params) -> Dict[str, Any]:
+        """Call a ZAP JSON endpoint and return the decoded body"""
+        async with session.get(path, params=params) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+    
+    async def _poll_until_complete_async(
+        self,
+        session: aiohttp.ClientSession,
+        status_path: str,
+        scan_id: str,
+        max_wait: float,
+        label: str
+    ):
+        """Async counterpart of _poll_until_complete"""
+        start_time = time.monotonic()
+        delay = self.MIN_POLL_INTERVAL
+        
+        while True:
+            response = await self._api_get(session, status_path, scanId=scan_id)
+            status = int(response.get("status", 0))
+            logger.debug(f"{label} {scan_id} progress: {status}%")
+            
+            if status >= 100:
+                return
+            
+            if time.monotonic() - start_time > max_wait:
+                raise TimeoutError(f"{label} timeout after {max_wait}s")
+            
+            await asyncio.sleep(delay)
+            delay = min(delay * self.POLL_BACKOFF, self.MAX_POLL_INTERVAL)
+    
+    def generate_html_report(self, out: Optional[IO[bytes]] = None) -> Union[str, int]:
+        """
+        Generate HTML vulnerability report
+        
+        Args:
+            out: Binary file-like object to stream the report into. Reports
+                on large sites run to tens of MB, so prefer this over
+                holding the whole report in memory.
+        
+        Returns:
+            The report HTML, or the number of bytes written when out is given
+        """
+        if not self.zap:
+            return "" if out is None else 0
+        
+        if out is None:
+            return self.zap.core.htmlreport()
+        
+        written = 0
+        with self.session.get(
+            f"{self.zap_url}/OTHER/core/other/htmlreport/",
+            stream=True,
+            timeout=300
+        ) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=self.REPORT_CHUNK_SIZE):
+                out.write(chunk)
+                written += len(chunk)
+        
+        return written
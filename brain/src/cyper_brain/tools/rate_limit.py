@@ -0,0 +1,172 @@
+"""Outbound request throttling: per-host windows for active testers, token buckets for API quotas"""
+
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlparse
+
+import requests
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    Refills at ``rate`` tokens per second up to ``capacity``. ``acquire``
+    blocks until a token is available; ``penalize`` empties the bucket and
+    holds refills until the provider's reset time.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = float(rate)
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if now < self._paused_until:
+            self._updated = now
+            return
+        elapsed = now - max(self._updated, self._paused_until)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Take one token, sleeping until one is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def penalize(self, seconds: float):
+        """Drain the bucket and stop refilling for ``seconds``"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = 0.0
+            self._updated = now
+            self._paused_until = max(self._paused_until, now + max(seconds, 0.0))
+
+
+class _HostState:
+    """Concurrency window and pause deadline for a single host"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.cond = threading.Condition()
+
+
+class HostRateLimiter:
+    """
+    Caps in-flight requests per host and backs off when the target pushes back
+
+    Each host (``urlparse(url).netloc``) gets its own concurrency window,
+    starting at ``max_concurrency``. A 429/503 response halves the window and
+    pauses the host for the ``Retry-After`` interval; every successful
+    response widens it again by one slot, up to ``max_concurrency``.
+    """
+
+    THROTTLE_STATUSES = (429, 503)
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        default_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.default_backoff = default_backoff
+        self.max_backoff = max_backoff
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def _state_for(self, url: str) -> _HostState:
+        host = urlparse(url).netloc
+        state = self._hosts.get(host)
+        if state is None:
+            with self._lock:
+                state = self._hosts.setdefault(host, _HostState(self.max_concurrency))
+        return state
+
+    def limit_for(self, url: str) -> int:
+        """Current concurrency window for the host serving ``url``"""
+        return self._state_for(url).limit
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """Hold one request slot for the host serving ``url``"""
+        state = self._state_for(url)
+        with state.cond:
+            while True:
+                wait = state.paused_until - time.monotonic()
+                if wait <= 0 and state.in_flight < state.limit:
+                    break
+                state.cond.wait(timeout=wait if wait > 0 else None)
+            state.in_flight += 1
+        try:
+            yield
+        finally:
+            with state.cond:
+                state.in_flight -= 1
+                state.cond.notify()
+
+    def record(self, url: str, status_code: int, retry_after: Optional[str] = None) -> bool:
+        """
+        Feed a response status back into the host's window
+
+        Returns:
+            True if the host is throttling us and the request should be retried
+        """
+        state = self._state_for(url)
+        with state.cond:
+            if status_code not in self.THROTTLE_STATUSES:
+                if state.limit < self.max_concurrency:
+                    state.limit += 1
+                    state.cond.notify()
+                return False
+
+            state.limit = max(1, state.limit // 2)
+            state.paused_until = max(
+                state.paused_until,
+                time.monotonic() + self._parse_retry_after(retry_after),
+            )
+        return True
+
+    def request(self, method: str, url: str, max_retries: int = 2, **kwargs) -> requests.Response:
+        """Send a request within the host's window, retrying when throttled"""
+        for attempt in range(max_retries + 1):
+            with self.slot(url):
+                response = requests.request(method, url, **kwargs)
+
+            throttled = self.record(url, response.status_code, response.headers.get("Retry-After"))
+            if not throttled or attempt == max_retries:
+                return response
+            response.close()
+
+    def _parse_retry_after(self, value: Optional[str]) -> float:
+        """Parse a Retry-After header (delta-seconds or HTTP-date)"""
+        if not value:
+            return self.default_backoff
+
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return self.default_backoff
+
+        return min(max(delay, 0.0), self.max_backoff)
@@ -1,17 +1,58 @@
 """SQL Injection vulnerability testing"""
 
+import codecs
 import re
 from typing import Dict, Any, List, Tuple
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 import requests
 
+from .rate_limit import HostRateLimiter
+
+# Database error signatures, folded into one alternation
+_SQL_ERROR_RE = re.compile(
+    "|".join([
+        r"SQL syntax.*MySQL",
+        r"Warning.*mysql_",
+        r"MySQLSyntaxErrorException",
+        r"PostgreSQL.*ERROR",
+        r"Warning.*pg_",
+        r"valid PostgreSQL result",
+        r"Npgsql\.",
+        r"PG::SyntaxError:",
+        r"org\.postgresql\.util\.PSQLException",
+        r"ERROR.*SQLite",
+        r"Warning.*SQLite3::",
+        r"System\.Data\.SqlClient\.SqlException",
+        r"Microsoft.*SQL Native Client error",
+        r"\[SQL Server\]",
+        r"ODBC SQL Server Driver",
+        r"SQLServer JDBC Driver",
+        r"Oracle.*error",
+        r"ORA-[0-9]{5}",
+    ]),
+    re.IGNORECASE,
+)
+
 
 class SQLInjectionTester:
     """SQL Injection vulnerability scanner"""
 
-    def __init__(self, timeout: int = 10):
+    # Streaming read size, and how much of the previous chunk is rescanned
+    # so that error signatures split across chunks are still caught
+    CHUNK_SIZE = 8192
+    CHUNK_OVERLAP = 64
+
+    def __init__(self, timeout: int = 10, max_concurrency_per_host: int = 8, max_retries: int = 2):
         self.timeout = timeout
+        self.max_retries = max_retries
+        self.rate_limiter = HostRateLimiter(max_concurrency=max_concurrency_per_host)
         self.payloads = self._load_payloads()
+        # Payload-side classification, done once instead of per response:
+        # (payload, is_union, is_time_based)
+        self._payload_meta = [
+            (payload, "UNION" in payload, "SLEEP" in payload or "WAITFOR" in payload)
+            for payload in self.payloads
+        ]
 
     def _load_payloads(self) -> List[str]:
         """Load SQL injection test payloads"""
@@ -59,6 +100,37 @@ class SQLInjectionTester:
             "1; EXEC sp_MSForEachTable 'DROP TABLE ?'",
         ]
 
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the per-host limiter"""
+        return self.rate_limiter.request(
+            method, url, max_retries=self.max_retries, timeout=self.timeout, **kwargs
+        )
+
+    def _read_response(self, response: requests.Response) -> Tuple[str, bool]:
+        """
+        Stream the response body, stopping at the first SQL error signature
+        
+        Returns:
+            (body text read so far, whether an error signature was seen)
+        """
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        chunks = []
+        tail = ""
+        
+        try:
+            for raw in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                chunk = decoder.decode(raw)
+                chunks.append(chunk)
+                window = tail + chunk
+                if _SQL_ERROR_RE.search(window):
+                    return "".join(chunks), True
+                tail = window[-self.CHUNK_OVERLAP:]
+            chunks.append(decoder.decode(b"", final=True))
+        finally:
+            response.close()
+        
+        return "".join(chunks), False
+
     def test_url(self, url: str, method: str = "GET", data: Dict = None) -> Dict[str, Any]:
         """
         Test URL for SQL injection vulnerabilities
@@ -112,9 +184,9 @@ class SQLInjectionTester:
         # Get baseline response
         try:
             if method == "GET":
-                baseline_response = requests.get(url, timeout=self.timeout)
+                baseline_response = self._send("GET", url)
             else:
-                baseline_response = requests.post(url, data=post_data, timeout=self.timeout)
+                baseline_response = self._send("POST", url, data=post_data)
             
             baseline_length = len(baseline_response.text)
             baseline_status = baseline_response.status_code
@@ -123,24 +195,30 @@ class SQLInjectionTester:
             return []
         
         # Test each payload
-        for payload in self.payloads:
+        for payload, is_union, is_time_based in self._payload_meta:
             try:
                 test_url, test_data = self._inject_payload(
                     url, param_name, payload, param_type, post_data
                 )
                 
                 if method == "GET":
-                    response = requests.get(test_url, timeout=self.timeout)
+                    response = self._send("GET", test_url, stream=True)
                 else:
-                    response = requests.post(test_url, data=test_data, timeout=self.timeout)
+                    response = self._send("POST", test_url, data=test_data, stream=True)
+                
+                response_text, error_seen = self._read_response(response)
                 
                 # Check for vulnerability indicators
-                is_vulnerable, detection_method = self._analyze_response(
-                    response,
-                    baseline_length,
-                    baseline_status,
-                    payload
-                )
+                if error_seen:
+                    is_vulnerable, detection_method = True, "error_based"
+                else:
+                    is_vulnerable, detection_method = self._analyze_response(
+                        response_text,
+                        response.status_code,
+                        baseline_length,
+                        baseline_status,
+                        is_union
+                    )
                 
                 if is_vulnerable:
                     vulnerabilities.append({
@@ -149,12 +227,12 @@ class SQLInjectionTester:
                         "payload": payload,
                         "detection_method": detection_method,
                         "severity": self._determine_severity(detection_method),
-                        "evidence": self._extract_evidence(response.text, payload),
+                        "evidence": self._extract_evidence(response_text, payload),
                     })
                     
             except Exception as e:
                 # Timeout might indicate time-based injection
-                if "SLEEP" in payload or "WAITFOR" in payload:
+                if is_time_based:
                     vulnerabilities.append({
                         "parameter": param_name,
                         "parameter_type": param_type,
@@ -199,47 +277,28 @@ class SQLInjectionTester:
 
     def _analyze_response(
         self,
-        response,
+        response_text: str,
+        status_code: int,
         baseline_length: int,
         baseline_status: int,
-        payload: str
+        is_union: bool
     ) -> Tuple[bool, str]:
         """Analyze response for SQL injection indicators"""
         
-        # Error-based detection
-        sql_errors = [
-            r"SQL syntax.*MySQL",
-            r"Warning.*mysql_",
-            r"MySQLSyntaxErrorException",
-            r"PostgreSQL.*ERROR",
-            r"Warning.*pg_",
-            r"valid PostgreSQL result",
-            r"Npgsql\.",
-            r"PG::SyntaxError:",
-            r"org\.postgresql\.util\.PSQLException",
-            r"ERROR.*SQLite",
-            r"Warning.*SQLite3::",
-            r"System\.Data\.SqlClient\.SqlException",
-            r"Microsoft.*SQL Native Client error",
-            r"\[SQL Server\]",
-            r"ODBC SQL Server Driver",
-            r"SQLServer JDBC Driver",
-            r"Oracle.*error",
-            r"ORA-[0-9]{5}",
-        ]
-        
-        for pattern in sql_errors:
-            if re.search(pattern, response.text, re.IGNORECASE):
-                return True, "error_based"
+        # Error-based detection (also catches signatures longer than the
+        # streaming overlap)
+        if _SQL_ERROR_RE.search(response_text):
+            return True, "error_based"
         
         # Boolean-based detection (significant content change)
-        length_diff = abs(len(response.text) - baseline_length)
+        text_len = len(response_text)
+        length_diff = abs(text_len - baseline_length)
         if length_diff > 100:  # Significant change
             return True, "boolean_based"
         
         # Union-based detection
-        if "UNION" in payload and response.status_code == 200:
-            if len(response.text) > baseline_length * 1.5:
+        if is_union and status_code == 200:
+            if text_len > baseline_length * 1.5:
                 return True, "union_based"
         
         return False, None
@@ -290,10 +349,11 @@ class SQLInjectionTester:
                     password_field: password
                 }
                 
-                response = requests.post(login_url, data=data, timeout=self.timeout, allow_redirects=False)
+                response = self._send("POST", login_url, data=data, allow_redirects=False)
                 
                 # Check if bypass was successful
-                if response.status_code in [200, 302] and "error" not in response.text.lower():
+                response_text = response.text
+                if response.status_code in [200, 302] and "error" not in response_text.lower():
                     vulnerabilities.append({
                         "type": "authentication_bypass",
                         "username_payload": username,
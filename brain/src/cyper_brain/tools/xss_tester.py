@@ -1,18 +1,50 @@
 """Cross-Site Scripting (XSS) vulnerability testing"""
 
+import codecs
+import html
 import re
 from typing import Dict, Any, List
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse, quote
 import requests
 from html.parser import HTMLParser
 
+from .rate_limit import HostRateLimiter
+
+# Context a reflection lands in, judged from the markup right before it
+_CONTEXT_RE = re.compile(
+    r"(?P<script_tag><script[^>]*>[^<]*$)"
+    r"|(?P<event_handler>\bon\w+\s*=\s*['\"]?[^'\"<>]*$)"
+    r"|(?P<attribute>\b(?:href|src)\s*=\s*['\"]?[^'\"<>]*$)",
+    re.IGNORECASE,
+)
+
+# Contexts a payload introduces on its own, highest severity first
+_PAYLOAD_CONTEXTS = (
+    ("<script", "script_tag"),
+    ("onerror=", "event_handler"),
+    ("onload=", "event_handler"),
+    ("href=", "attribute"),
+    ("src=", "attribute"),
+)
+
 
 class XSSTester:
     """Cross-Site Scripting vulnerability scanner"""
 
-    def __init__(self, timeout: int = 10):
+    # Characters of markup before a reflection inspected to classify its context
+    CONTEXT_WINDOW = 128
+    # Characters kept after a reflection for evidence before streaming stops
+    EVIDENCE_MARGIN = 50
+    CHUNK_SIZE = 8192
+
+    def __init__(self, timeout: int = 10, max_concurrency_per_host: int = 8, max_retries: int = 2):
         self.timeout = timeout
+        self.max_retries = max_retries
+        self.rate_limiter = HostRateLimiter(max_concurrency=max_concurrency_per_host)
         self.payloads = self._load_payloads()
+        for payload_info in self.payloads:
+            payload_info["payload_context"] = self._payload_context(payload_info["payload"])
+            payload_info["reflection_re"] = self._reflection_pattern(payload_info["payload"])
 
     def _load_payloads(self) -> List[Dict[str, str]]:
         """Load XSS test payloads"""
@@ -52,6 +84,47 @@ class XSSTester:
             {"payload": "%253Cscript%253Ealert(1)%253C/script%253E", "type": "reflected", "context": "html"},
         ]
 
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the per-host limiter"""
+        return self.rate_limiter.request(
+            method, url, max_retries=self.max_retries, timeout=self.timeout, **kwargs
+        )
+
+    def _read_response(self, response: requests.Response, payload: str) -> str:
+        """
+        Stream the response body, stopping shortly after the payload is reflected
+        
+        Reading continues for EVIDENCE_MARGIN characters past the first exact
+        reflection so the evidence snippet is complete.
+        """
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        chunks = []
+        read = 0
+        tail = ""
+        stop_at = None
+        
+        try:
+            for raw in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                chunk = decoder.decode(raw)
+                chunks.append(chunk)
+                
+                if stop_at is None:
+                    window = tail + chunk
+                    index = window.find(payload)
+                    if index != -1:
+                        window_start = read - len(tail)
+                        stop_at = window_start + index + len(payload) + self.EVIDENCE_MARGIN
+                    tail = window[-(len(payload) - 1):] if len(payload) > 1 else ""
+                
+                read += len(chunk)
+                if stop_at is not None and read >= stop_at:
+                    return "".join(chunks)
+            chunks.append(decoder.decode(b"", final=True))
+        finally:
+            response.close()
+        
+        return "".join(chunks)
+
     def test_url(self, url: str, method: str = "GET", data: Dict = None) -> Dict[str, Any]:
         """
         Test URL for XSS vulnerabilities
@@ -108,16 +181,20 @@ class XSSTester:
             try:
                 if param_type == "GET":
                     test_url = self._inject_payload_get(url, param_name, payload)
-                    response = requests.get(test_url, timeout=self.timeout)
+                    response = self._send("GET", test_url, stream=True)
                 else:
                     test_data = post_data.copy() if post_data else {}
                     test_data[param_name] = payload
-                    response = requests.post(url, data=test_data, timeout=self.timeout)
+                    response = self._send("POST", url, data=test_data, stream=True)
+                
+                response_text = self._read_response(response, payload)
                 
                 # Check if payload is reflected
-                if self._is_reflected(response.text, payload):
+                if self._is_reflected(response_text, payload_info["reflection_re"]):
                     # Determine if actually exploitable
-                    is_exploitable, context = self._is_exploitable(response.text, payload)
+                    is_exploitable, context = self._is_exploitable(
+                        response_text, payload, payload_info["payload_context"]
+                    )
                     
                     if is_exploitable:
                         vulnerabilities.append({
@@ -127,7 +204,7 @@ class XSSTester:
                             "xss_type": payload_info["type"],
                             "context": context,
                             "severity": self._determine_severity(payload_info["type"], context),
-                            "evidence": self._extract_evidence(response.text, payload),
+                            "evidence": self._extract_evidence(response_text, payload),
                         })
                         
             except Exception as e:
@@ -153,59 +230,51 @@ class XSSTester:
         
         return new_url
 
-    def _is_reflected(self, response_text: str, payload: str) -> bool:
-        """Check if payload is reflected in response"""
-        # Check for exact match
-        if payload in response_text:
-            return True
-        
-        # Check for URL encoded version
-        import urllib.parse
-        encoded_payload = urllib.parse.quote(payload)
-        if encoded_payload in response_text:
-            return True
-        
-        # Check for HTML encoded version
-        import html
-        html_encoded = html.escape(payload)
-        if html_encoded in response_text:
-            return True
-        
-        return False
+    def _reflection_pattern(self, payload: str) -> "re.Pattern[str]":
+        """Compile the raw, URL-encoded and HTML-encoded payload forms into one pattern"""
+        forms = dict.fromkeys([payload, quote(payload), html.escape(payload)])
+        return re.compile("|".join(re.escape(form) for form in forms))
+
+    def _is_reflected(self, response_text: str, reflection_re: "re.Pattern[str]") -> bool:
+        """Check if payload is reflected in response (any encoding, single scan)"""
+        return reflection_re.search(response_text) is not None
 
-    def _is_exploitable(self, response_text: str, payload: str) -> tuple:
+    def _is_exploitable(
+        self, response_text: str, payload: str, payload_context: str = "html"
+    ) -> tuple:
         """
         Determine if reflected input is actually exploitable
         
+        The context is taken from the markup just before the reflection
+        (open <script>, event handler or href/src attribute value); if the
+        reflection is not inside one, the payload's own context applies.
+        
         Returns:
             (is_exploitable: bool, context: str)
         """
-        # Check if payload is properly escaped/encoded
-        import html
-        escaped_payload = html.escape(payload)
-        
-        # If payload is HTML escaped, it's likely not exploitable
-        if escaped_payload in response_text and payload not in response text:
-            return False, "escaped"
+        index = response_text.find(payload)
         
-        # Check context where payload appears
-        contexts = {
-            "<script": "script_tag",
-            "onerror=": "event_handler",
-            "onload=": "event_handler",
-            "href=": "attribute",
-            "src=": "attribute",
-        }
+        if index == -1:
+            # If payload is HTML escaped, it's likely not exploitable
+            if html.escape(payload) in response_text:
+                return False, "escaped"
+            return False, "none"
         
-        for pattern, context in contexts.items():
-            if pattern in payload.lower() and payload in response_text:
-                return True, context
+        prefix = response_text[max(0, index - self.CONTEXT_WINDOW):index]
+        match = _CONTEXT_RE.search(prefix)
+        if match:
+            return True, match.lastgroup
         
         # Default: if reflected without escaping, potentially exploitable
-        if payload in response_text:
-            return True, "html"
-        
-        return False, "none"
+        return True, payload_context
+
+    def _payload_context(self, payload: str) -> str:
+        """Context a payload introduces by itself, in priority order"""
+        lowered = payload.lower()
+        for marker, context in _PAYLOAD_CONTEXTS:
+            if marker in lowered:
+                return context
+        return "html"
 
     def _determine_severity(self, xss_type: str, context: str) -> str:
         """Determine severity based on XSS type and context"""
@@ -225,9 +294,10 @@ class XSSTester:
         if index == -1:
             return "Payload reflected but exact location unclear"
         
-        start = max(0, index - 50)
-        end = min(len(response_text), index + len(payload) + 50)
+        start = max(0, index - self.EVIDENCE_MARGIN)
+        end = min(len(response_text), index + len(payload) + self.EVIDENCE_MARGIN)
         
+        # Copy out just the window so the finding doesn't pin the whole body
         return response_text[start:end]
 
     def test_dom_xss(self, url: str) -> Dict[str, Any]:
@@ -244,7 +314,8 @@ class XSSTester:
         # This is a simplified version that checks for dangerous sinks
         
         try:
-            response = requests.get(url, timeout=self.timeout)
+            response = self._send("GET", url)
+            response_text = response.text
             
             dangerous_sinks = [
                 r"innerHTML\s*=",
@@ -262,7 +333,7 @@ class XSSTester:
             vulnerabilities = []
             
             for sink in dangerous_sinks:
-                if re.search(sink, response.text, re.IGNORECASE):
+                if re.search(sink, response_text, re.IGNORECASE):
                     vulnerabilities.append({
                         "type": "potential_dom_xss",
                         "dangerous_sink": sink,
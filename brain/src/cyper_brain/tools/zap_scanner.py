@@ -1,23 +1,110 @@
 """OWASP ZAP integration for web application scanning"""
 
+import logging
+import shutil
 import subprocess
-import json
+import sys
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson parses ZAP's status/alert payloads several times faster than json
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+logger = logging.getLogger(__name__)
+
+# ZAP risk labels, interned so every parsed alert shares the same objects
+_RISK_LEVELS = {
+    level: sys.intern(level)
+    for level in ("High", "Medium", "Low", "Informational", "Unknown")
+}
+
 
 class ZAPScanner:
-    """OWASP ZAP web application scanner"""
+    """
+    OWASP ZAP web application scanner
+
+    Use as a context manager to keep one daemon alive across many scans:
+
+        with ZAPScanner() as zap:
+            results = [zap.full_scan(url) for url in urls]
+    """
 
-    def __init__(self, zap_path: Optional[str] = None, api_key: Optional[str] = None):
+    # Status polls start here and double while progress is flat
+    MIN_POLL_INTERVAL = 0.25
+
+    # Endpoints hit on every poll; their full URLs are built once per scanner
+    POLL_ENDPOINTS = {
+        "spider_status": "/JSON/spider/view/status/",
+        "ascan_status": "/JSON/ascan/view/status/",
+        "pscan_records": "/JSON/pscan/view/recordsToScan/",
+    }
+
+    def __init__(
+        self,
+        zap_path: Optional[str] = None,
+        api_key: Optional[str] = None,
+        concurrency: int = 4,
+        max_active_scans: int = 2,
+        threads_per_host: int = 10,
+        hosts_per_scan: int = 2,
+        spider_threads: int = 10,
+        spider_max_children: Optional[int] = None,
+    ):
         self.zap_path = zap_path or "zap.sh"
         self.api_key = api_key or "cyper-security-zap-key"
+        self.concurrency = concurrency
+        self.threads_per_host = threads_per_host
+        self.hosts_per_scan = hosts_per_scan
+        self.spider_threads = spider_threads
+        self.spider_max_children = spider_max_children
+        # Active scans are the heavy part for ZAP; cap them separately
+        self._active_scan_slots = threading.Semaphore(max_active_scans)
         self.zap_proxy = "http://127.0.0.1:8090"
         self.process = None
+        self.session = self._create_session()
+        self._endpoints = {
+            name: f"{self.zap_proxy}{path}" for name, path in self.POLL_ENDPOINTS.items()
+        }
+
+    def _create_session(self) -> requests.Session:
+        """Keep-alive session for the ZAP API, retrying transient gateway errors"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _api_get(self, path: str, **params) -> Dict[str, Any]:
+        """Call a ZAP JSON API endpoint and return the decoded response"""
+        response = self.session.get(
+            f"{self.zap_proxy}{path}",
+            params={"apikey": self.api_key, **params},
+            timeout=30,
+        )
+        return _loads(response.content)
 
-    def start_zap(self) -> bool:
-        """Start ZAP in daemon mode"""
+    def _poll(self, endpoint: str, params: Dict[str, str]) -> Dict[str, Any]:
+        """Hit a prebuilt polling endpoint with a caller-owned params dict"""
+        response = self.session.get(self._endpoints[endpoint], params=params, timeout=30)
+        return _loads(response.content)
+
+    def start_zap(self, startup_timeout: float = 60.0) -> bool:
+        """Start ZAP in daemon mode and wait until its API answers"""
         try:
             cmd = [
                 self.zap_path,
@@ -32,18 +119,98 @@ class ZAPScanner:
                 stderr=subprocess.PIPE
             )
             
-            # Wait for ZAP to start
-            time.sleep(10)
-            return True
+            if self._wait_until_ready(startup_timeout):
+                self._configure_zap()
+                return True
+            
+            logger.error("ZAP did not become ready within %ss", startup_timeout)
         except Exception as e:
-            print(f"Failed to start ZAP: {e}")
-            return False
+            logger.error("Failed to start ZAP: %s", e)
+        
+        # Don't leave a half-started daemon holding the port
+        self.stop_zap()
+        return False
+
+    def _configure_zap(self):
+        """Apply scanner thread settings; ZAP's defaults are tuned for desktop use"""
+        self._api_get("/JSON/ascan/action/setOptionThreadPerHost/", Integer=str(self.threads_per_host))
+        self._api_get("/JSON/ascan/action/setOptionHostPerScan/", Integer=str(self.hosts_per_scan))
+        self._api_get("/JSON/spider/action/setOptionThreadCount/", Integer=str(self.spider_threads))
+        
+        if self.spider_max_children is not None:
+            self._api_get(
+                "/JSON/spider/action/setOptionMaxChildren/", Integer=str(self.spider_max_children)
+            )
+
+    def _add_scan_policy(
+        self, attack_strength: Optional[str] = None, alert_threshold: Optional[str] = None
+    ) -> str:
+        """
+        Create a throwaway scan policy with the given levels
+
+        Scans that name it leave ZAP's default policy untouched, so the levels
+        never leak into later scans or into scans running alongside.
+        """
+        name = f"cyper-{uuid.uuid4().hex}"
+        params = {"scanPolicyName": name}
+        if attack_strength:
+            params["attackStrength"] = attack_strength
+        if alert_threshold:
+            params["alertThreshold"] = alert_threshold
+        
+        self._api_get("/JSON/ascan/action/addScanPolicy/", **params)
+        return name
+
+    def _remove_scan_policy(self, name: str):
+        """Delete a policy made by _add_scan_policy"""
+        try:
+            self._api_get("/JSON/ascan/action/removeScanPolicy/", scanPolicyName=name)
+        except Exception as e:
+            logger.warning("Failed to remove scan policy %s: %s", name, e)
+
+    def _wait_until_ready(self, timeout: float, interval: float = 0.5) -> bool:
+        """Poll the version endpoint until ZAP answers, the daemon exits, or timeout"""
+        deadline = time.monotonic() + timeout
+        
+        while time.monotonic() < deadline:
+            if self.process and self.process.poll() is not None:
+                return False
+            
+            try:
+                # Plain request: the session's retry adapter would stretch each probe
+                response = requests.get(
+                    f"{self.zap_proxy}/JSON/core/view/version/",
+                    params={"apikey": self.api_key},
+                    timeout=1,
+                )
+                if response.status_code == 200:
+                    return True
+            except (requests.ConnectionError, requests.Timeout):
+                pass
+            
+            time.sleep(interval)
+        
+        return False
 
     def stop_zap(self):
         """Stop ZAP daemon"""
         if self.process:
             self.process.terminate()
             self.process.wait()
+            self.process = None
+
+    def __enter__(self) -> "ZAPScanner":
+        if not self.start_zap():
+            self.stop_zap()
+            raise RuntimeError("ZAP daemon failed to start")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop_zap()
+
+    def new_session(self) -> Dict[str, Any]:
+        """Discard the current site tree and alerts without restarting the daemon"""
+        return self._api_get("/JSON/core/action/newSession/", overwrite="true")
 
     def spider_scan(self, target_url: str, max_duration: int = 300) -> Dict[str, Any]:
         """
@@ -58,16 +225,9 @@ class ZAPScanner:
         """
         try:
             # Start spider via ZAP API
-            cmd = [
-                "curl", "-s",
-                f"{self.zap_proxy}/JSON/spider/action/scan/",
-                f"?apikey={self.api_key}",
-                f"&url={target_url}",
-                "&maxDuration=" + str(max_duration)
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            response = json.loads(result.stdout)
+            response = self._api_get(
+                "/JSON/spider/action/scan/", url=target_url, maxDuration=str(max_duration)
+            )
             
             if "scan" in response:
                 scan_id = response["scan"]
@@ -83,41 +243,51 @@ class ZAPScanner:
         except Exception as e:
             return {"error": str(e)}
 
-    def active_scan(self, target_url: str) -> Dict[str, Any]:
+    def active_scan(
+        self,
+        target_url: str,
+        attack_strength: Optional[str] = None,
+        alert_threshold: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Perform active security scan
         
         Args:
             target_url: Target URL to scan
+            attack_strength: LOW, MEDIUM, HIGH or INSANE (policy default if omitted)
+            alert_threshold: OFF, LOW, MEDIUM or HIGH (policy default if omitted)
             
         Returns:
             Dictionary with scan results including vulnerabilities
         """
+        policy_name = None
         try:
-            # Start active scan
-            cmd = [
-                "curl", "-s",
-                f"{self.zap_proxy}/JSON/ascan/action/scan/",
-                f"?apikey={self.api_key}",
-                f"&url={target_url}"
-            ]
+            if attack_strength or alert_threshold:
+                policy_name = self._add_scan_policy(attack_strength, alert_threshold)
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            response = json.loads(result.stdout)
-            
-            if "scan" in response:
-                scan_id = response["scan"]
-                
-                # Wait for scan to complete
-                self._wait_for_active_scan(scan_id)
+            with self._active_scan_slots:
+                # Start active scan
+                scan_params = {"url": target_url}
+                if policy_name:
+                    scan_params["scanPolicyName"] = policy_name
+                response = self._api_get("/JSON/ascan/action/scan/", **scan_params)
                 
-                # Get vulnerabilities
-                return self._get_alerts()
+                if "scan" in response:
+                    scan_id = response["scan"]
+                    
+                    # Wait for scan to complete
+                    self._wait_for_active_scan(scan_id)
+                    
+                    # Get vulnerabilities
+                    return self._get_alerts(target_url)
             
             return {"error": "Failed to start active scan"}
             
         except Exception as e:
             return {"error": str(e)}
+        finally:
+            if policy_name:
+                self._remove_scan_policy(policy_name)
 
     def passive_scan(self, target_url: str) -> Dict[str, Any]:
         """
@@ -131,93 +301,99 @@ class ZAPScanner:
         """
         try:
             # Access the URL through ZAP proxy to trigger passive scanning
-            cmd = [
-                "curl", "-s",
-                "-x", "127.0.0.1:8090",
-                target_url
-            ]
-            
-            subprocess.run(cmd, capture_output=True)
+            proxies = {"http": self.zap_proxy, "https": self.zap_proxy}
+            self.session.get(target_url, proxies=proxies, timeout=30, verify=False)
             
-            # Wait a bit for passive scanning
-            time.sleep(5)
+            # Wait for the passive scanner to drain its queue
+            self._wait_for_passive_scan()
             
-            return self._get_alerts()
+            return self._get_alerts(target_url)
             
         except Exception as e:
             return {"error": str(e)}
 
-    def _wait_for_spider(self, scan_id: str, timeout: int = 300):
-        """Wait for spider scan to complete"""
+    def _wait_for_passive_scan(self, timeout: int = 60, interval: float = 0.5):
+        """Wait until the passive scanner has no records left to scan"""
         start_time = time.time()
+        params = {"apikey": self.api_key}
         
         while time.time() - start_time < timeout:
-            cmd = [
-                "curl", "-s",
-                f"{self.zap_proxy}/JSON/spider/view/status/",
-                f"?apikey={self.api_key}",
-                f"&scanId={scan_id}"
-            ]
+            response = self._poll("pscan_records", params)
+            
+            if response.get("recordsToScan") == "0":
+                break
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            response = json.loads(result.stdout)
+            time.sleep(interval)
+
+    def _wait_for_spider(self, scan_id: str, timeout: int = 300, max_interval: float = 2.0):
+        """Wait for spider scan to complete"""
+        start_time = time.time()
+        interval = self.MIN_POLL_INTERVAL
+        last_status = None
+        params = {"apikey": self.api_key, "scanId": scan_id}
+        
+        while time.time() - start_time < timeout:
+            response = self._poll("spider_status", params)
+            status = response.get("status")
             
-            if response.get("status") == "100":
+            if status == "100":
                 break
-                
-            time.sleep(2)
+            
+            interval = self._next_poll_interval(interval, status, last_status, max_interval)
+            last_status = status
+            time.sleep(interval)
 
-    def _wait_for_active_scan(self, scan_id: str, timeout: int = 600):
+    def _wait_for_active_scan(self, scan_id: str, timeout: int = 600, max_interval: float = 5.0):
         """Wait for active scan to complete"""
         start_time = time.time()
+        interval = self.MIN_POLL_INTERVAL
+        last_status = None
+        # Built once and reused for every poll
+        params = {"apikey": self.api_key, "scanId": scan_id}
         
         while time.time() - start_time < timeout:
-            cmd = [
-                "curl", "-s",
-                f"{self.zap_proxy}/JSON/ascan/view/status/",
-                f"?apikey={self.api_key}",
-                f"&scanId={scan_id}"
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            response = json.loads(result.stdout)
+            response = self._poll("ascan_status", params)
+            status = response.get("status")
             
-            if response.get("status") == "100":
+            if status == "100":
                 break
-                
-            time.sleep(5)
+            
+            interval = self._next_poll_interval(interval, status, last_status, max_interval)
+            last_status = status
+            time.sleep(interval)
+
+    def _next_poll_interval(
+        self, interval: float, status: Optional[str], last_status: Optional[str], max_interval: float
+    ) -> float:
+        """Back off while a scan's progress is flat; poll quickly again once it moves"""
+        if status != last_status:
+            return self.MIN_POLL_INTERVAL
+        return min(max_interval, interval * 2)
 
     def _get_spider_results(self, scan_id: str) -> Dict[str, Any]:
         """Get spider scan results"""
-        cmd = [
-            "curl", "-s",
-            f"{self.zap_proxy}/JSON/spider/view/results/",
-            f"?apikey={self.api_key}",
-            f"&scanId={scan_id}"
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        return json.loads(result.stdout)
-
-    def _get_alerts(self) -> Dict[str, Any]:
-        """Get all alerts (vulnerabilities)"""
-        cmd = [
-            "curl", "-s",
-            f"{self.zap_proxy}/JSON/core/view/alerts/",
-            f"?apikey={self.api_key}"
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        response = json.loads(result.stdout)
+        return self._api_get("/JSON/spider/view/results/", scanId=scan_id)
+
+    def _get_alerts(self, base_url: Optional[str] = None) -> Dict[str, Any]:
+        """Get all alerts (vulnerabilities), optionally only those under base_url"""
+        if base_url:
+            response = self._api_get("/JSON/core/view/alerts/", baseurl=base_url)
+        else:
+            response = self._api_get("/JSON/core/view/alerts/")
         
         if "alerts" in response:
-            # Parse and categorize alerts
+            # Parse and categorize alerts in a single pass
             vulnerabilities = []
+            by_risk = {"High": 0, "Medium": 0, "Low": 0, "Informational": 0}
             
             for alert in response["alerts"]:
-                vuln = {
+                risk = _RISK_LEVELS.get(alert.get("risk"), "Unknown")
+                if risk in by_risk:
+                    by_risk[risk] += 1
+                
+                vulnerabilities.append({
                     "name": alert.get("name", "Unknown"),
-                    "risk": alert.get("risk", "Unknown"),
+                    "risk": risk,
                     "confidence": alert.get("confidence", "Unknown"),
                     "url": alert.get("url", ""),
                     "description": alert.get("description", ""),
@@ -225,28 +401,16 @@ class ZAPScanner:
                     "reference": alert.get("reference", ""),
                     "cwe_id": alert.get("cweid", ""),
                     "wasc_id": alert.get("wascid", ""),
-                }
-                vulnerabilities.append(vuln)
+                })
             
             return {
                 "total": len(vulnerabilities),
                 "vulnerabilities": vulnerabilities,
-                "by_risk": self._categorize_by_risk(vulnerabilities)
+                "by_risk": by_risk
             }
         
         return {"total": 0, "vulnerabilities": [], "by_risk": {}}
 
-    def _categorize_by_risk(self, vulnerabilities: List[Dict]) -> Dict[str, int]:
-        """Categorize vulnerabilities by risk level"""
-        categories = {"High": 0, "Medium": 0, "Low": 0, "Informational": 0}
-        
-        for vuln in vulnerabilities:
-            risk = vuln.get("risk", "Informational")
-            if risk in categories:
-                categories[risk] += 1
-        
-        return categories
-
     def full_scan(self, target_url: str) -> Dict[str, Any]:
         """
         Perform comprehensive scan (spider + active + passive)
@@ -261,17 +425,22 @@ class ZAPScanner:
             "target": target_url,
             "timestamp": time.time(),
             "spider": {},
+            "passive_scan": {},
             "active_scan": {},
             "summary": {}
         }
         
-        # Spider scan
-        print(f"Starting spider scan on {target_url}...")
-        results["spider"] = self.spider_scan(target_url)
-        
-        # Active scan
-        print(f"Starting active scan on {target_url}...")
-        results["active_scan"] = self.active_scan(target_url)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # Spider and passive scan are independent; run them side by side
+            logger.info("Starting spider and passive scan on %s", target_url)
+            spider_future = executor.submit(self.spider_scan, target_url)
+            passive_future = executor.submit(self.passive_scan, target_url)
+            
+            # Active scan attacks the URLs the spider discovered, so it waits on it
+            results["spider"] = spider_future.result()
+            logger.info("Starting active scan on %s", target_url)
+            results["active_scan"] = self.active_scan(target_url)
+            results["passive_scan"] = passive_future.result()
         
         # Generate summary
         if "vulnerabilities" in results["active_scan"]:
@@ -283,14 +452,30 @@ class ZAPScanner:
         
         return results
 
+    def scan_targets(self, urls: List[str], concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Run full_scan against several targets on the same ZAP daemon
+        
+        Args:
+            urls: Target URLs to scan
+            concurrency: Targets scanned at once (defaults to self.concurrency)
+            
+        Returns:
+            One full_scan result per URL, in input order
+        """
+        workers = concurrency or self.concurrency
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.full_scan, urls))
+
     def generate_report(self, output_file: str):
         """Generate HTML report"""
-        cmd = [
-            "curl", "-s",
+        with open(output_file, "wb") as f, self.session.get(
             f"{self.zap_proxy}/OTHER/core/other/htmlreport/",
-            f"?apikey={self.api_key}",
-            "-o", output_file
-        ]
-        
-        subprocess.run(cmd)
-        print(f"Report saved to {output_file}")
+            params={"apikey": self.api_key},
+            timeout=30,
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            shutil.copyfileobj(response.raw, f, length=65536)
+        logger.info("Report saved to %s", output_file)
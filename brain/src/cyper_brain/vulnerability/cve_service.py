@@ -7,21 +7,57 @@ Following TDD - tests in test_cve_service.py
 
 import os
 import logging
+import re
+import sqlite3
+import threading
+import time
 import requests
-from dataclasses import dataclass, field
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from typing import List, Optional, Dict
 from functools import lru_cache
 
+from ..tools.rate_limit import TokenBucket
+
+try:
+    from orjson import dumps as _dumps, loads as _loads
+except ImportError:
+    import json
+    
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+    
+    _loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# CVSS v3 qualitative ratings: lower bound of each band above NONE
+# (scores carry one decimal, so anything below 0.1 is 0.0)
+_SEVERITY_BOUNDARIES = (0.1, 4.0, 7.0, 9.0)
+_SEVERITY_LABELS = ("NONE", "LOW", "MEDIUM", "HIGH", "CRITICAL")
+
+_CVE_ID_RE = re.compile(r"^CVE-\d{4}-\d{4,7}$")
+
+
+def _normalize_cve_id(cve_id: str) -> str:
+    """Canonical form of a CVE ID as reported by scanners (cve-2021-44228 -> CVE-2021-44228)"""
+    return cve_id.strip().upper()
+
+# NVD counts requests over a rolling 30 second window
+_NVD_WINDOW_SECONDS = 30
+
+# lookup_many threads only overlap network latency; pacing is the limiter's job
+_LOOKUP_WORKERS = 4
+
 
 class VulnerabilityNotFound(Exception):
     """Raised when CVE not found in database"""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class CVSSScore:
     """CVSS vulnerability score"""
     version: str = "3.1"
@@ -30,19 +66,10 @@ class CVSSScore:
     
     def get_severity(self) -> str:
         """Map score to severity level"""
-        if self.base_score == 0.0:
-            return "NONE"
-        elif self.base_score < 4.0:
-            return "LOW"
-        elif self.base_score < 7.0:
-            return "MEDIUM"
-        elif self.base_score < 9.0:
-            return "HIGH"
-        else:
-            return "CRITICAL"
+        return _SEVERITY_LABELS[bisect_right(_SEVERITY_BOUNDARIES, self.base_score)]
 
 
-@dataclass
+@dataclass(slots=True)
 class CVEData:
     """CVE vulnerability data"""
     cve_id: str
@@ -77,12 +104,20 @@ class CVEService:
     Uses NVD API 2.0: https://nvd.nist.gov/developers
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache_path: Optional[str] = None,
+        cache_ttl: int = 86400
+    ):
         """
         Initialize CVE service
         
         Args:
             api_key: NVD API key (optional, increases rate limits)
+            cache_path: SQLite file for a persistent CVE cache shared across
+                runs (optional, falls back to CVE_CACHE_PATH; memory-only if unset)
+            cache_ttl: Seconds a persisted CVE record stays fresh
         """
         self.api_key = api_key or os.getenv("NVD_API_KEY", "")
         self.base_url = "https://services.nvd.nist.gov/rest/json/cves/2.0"
@@ -93,14 +128,32 @@ class CVEService:
         
         # Rate limiting: 5 requests/30s without key, 50/30s with key
         self.rate_limit = 50 if self.api_key else 5
+        # Capacity 1 spreads requests evenly so no window ever sees a burst
+        self._limiter = TokenBucket(rate=self.rate_limit / _NVD_WINDOW_SECONDS, capacity=1)
+        
+        # Second cache tier behind lookup's in-memory LRU
+        self.cache_ttl = cache_ttl
+        self._cache_lock = threading.Lock()
+        self._cache_db = None
+        cache_path = cache_path or os.getenv("CVE_CACHE_PATH")
+        if cache_path:
+            self._cache_db = sqlite3.connect(
+                cache_path, isolation_level=None, check_same_thread=False
+            )
+            self._cache_db.execute("PRAGMA journal_mode=WAL")
+            self._cache_db.execute(
+                "CREATE TABLE IF NOT EXISTS cve (id TEXT PRIMARY KEY, payload BLOB, ts INTEGER)"
+            )
     
-    @lru_cache(maxsize=1000)
     def lookup(self, cve_id: str) -> CVEData:
         """
         Lookup CVE by ID
         
+        Checks the in-memory cache, then the persistent cache (if
+        configured), then NVD.
+        
         Args:
-            cve_id: CVE identifier (e.g., CVE-2024-1234)
+            cve_id: CVE identifier (e.g., CVE-2024-1234, case-insensitive)
         
         Returns:
             CVEData object
@@ -108,11 +161,67 @@ class CVEService:
         Raises:
             VulnerabilityNotFound: If CVE not found
         """
+        cve_id = _normalize_cve_id(cve_id)
+        if not _CVE_ID_RE.match(cve_id):
+            raise VulnerabilityNotFound(f"Malformed CVE ID: {cve_id}")
+        
+        return self._lookup(cve_id)
+    
+    @lru_cache(maxsize=4096)
+    def _lookup(self, cve_id: str) -> CVEData:
+        """Cached lookup of an already normalized, well-formed CVE ID"""
+        cve_data = self._cache_get(cve_id)
+        if cve_data is not None:
+            return cve_data
+        
+        cve_data = self._fetch_from_nvd(cve_id)
+        self._cache_put(cve_data)
+        return cve_data
+    
+    def _cache_get(self, cve_id: str) -> Optional[CVEData]:
+        """Read a fresh CVE record from the persistent cache"""
+        if self._cache_db is None:
+            return None
+        
+        with self._cache_lock:
+            row = self._cache_db.execute(
+                "SELECT payload FROM cve WHERE id = ? AND ts >= ?",
+                (cve_id, int(time.time()) - self.cache_ttl)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        
+        record = _loads(row[0])
+        for key in ("published_date", "last_modified"):
+            if record[key]:
+                record[key] = datetime.fromisoformat(record[key])
+        return CVEData(**record)
+    
+    def _cache_put(self, cve_data: CVEData) -> None:
+        """Write a CVE record to the persistent cache"""
+        if self._cache_db is None:
+            return
+        
+        record = asdict(cve_data)
+        for key in ("published_date", "last_modified"):
+            if record[key]:
+                record[key] = record[key].isoformat()
+        
+        with self._cache_lock:
+            self._cache_db.execute(
+                "INSERT OR REPLACE INTO cve (id, payload, ts) VALUES (?, ?, ?)",
+                (cve_data.cve_id, _dumps(record), int(time.time()))
+            )
+    
+    def _fetch_from_nvd(self, cve_id: str) -> CVEData:
+        """Fetch and parse a single CVE record from the NVD API"""
         try:
             url = f"{self.base_url}"
             params = {"cveId": cve_id}
             
             logger.info(f"Looking up {cve_id} from NVD")
+            self._limiter.acquire()
             response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
@@ -195,15 +304,75 @@ class CVEService:
         Returns:
             Enriched finding with CVE data
         """
-        enriched = finding.copy()
-        
         cve_id = finding.get("cve_id")
-        if not cve_id:
-            return enriched
+        cve_data = self._lookup_for_enrichment(cve_id) if cve_id else None
+        return self._apply_cve_data(finding, cve_data)
+    
+    def enrich_findings(self, findings: List[Dict], max_workers: Optional[int] = None) -> List[Dict]:
+        """
+        Enrich multiple findings
+        
+        Each distinct CVE ID is looked up once via lookup_many.
+        """
+        cve_data = self.lookup_many(
+            [f["cve_id"] for f in findings if f.get("cve_id")],
+            max_workers=max_workers
+        )
+        return [
+            self._apply_cve_data(
+                f, cve_data.get(_normalize_cve_id(f["cve_id"])) if f.get("cve_id") else None
+            )
+            for f in findings
+        ]
+    
+    def lookup_many(self, cve_ids: List[str], max_workers: Optional[int] = None) -> Dict[str, CVEData]:
+        """
+        Lookup several CVEs at once
         
+        NVD 2.0 takes a single cveId per request, so IDs are normalized,
+        duplicates (including case variants) are dropped, and the remaining
+        lookups run on a small thread pool over the service's keep-alive
+        session. Every NVD request waits on the
+        service's rate limiter, so the pool size never affects pacing.
+        Cached IDs never reach the network.
+        
+        Args:
+            cve_ids: CVE identifiers, duplicates and any casing allowed
+            max_workers: Lookup threads (default: 4)
+        
+        Returns:
+            Mapping of normalized CVE ID to CVEData; IDs that are malformed, unknown
+            or fail to fetch are logged and left out
+        """
+        unique_ids = list(dict.fromkeys(_normalize_cve_id(c) for c in cve_ids))
+        if not unique_ids:
+            return {}
+        
+        workers = max_workers or min(_LOOKUP_WORKERS, len(unique_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self._lookup_for_enrichment, unique_ids))
+        
+        return {
+            cve_id: cve_data
+            for cve_id, cve_data in zip(unique_ids, results)
+            if cve_data is not None
+        }
+    
+    def _lookup_for_enrichment(self, cve_id: str) -> Optional[CVEData]:
+        """Lookup a CVE, logging instead of raising on failure"""
         try:
-            cve_data = self.lookup(cve_id)
-            
+            return self.lookup(cve_id)
+        except VulnerabilityNotFound:
+            logger.warning(f"CVE {cve_id} not found in NVD")
+        except Exception as e:
+            logger.error(f"Failed to enrich with {cve_id}: {e}")
+        return None
+    
+    def _apply_cve_data(self, finding: Dict, cve_data: Optional[CVEData]) -> Dict:
+        """Copy of finding with CVE fields merged in (unchanged if no data)"""
+        enriched = finding.copy()
+        
+        if cve_data is not None:
             enriched.update({
                 "cvss_score": cve_data.cvss_score,
                 "severity": cve_data.severity,
@@ -212,18 +381,9 @@ class CVEService:
                 "references": cve_data.references,
                 "cwe_ids": cve_data.cwe_ids
             })
-            
-        except VulnerabilityNotFound:
-            logger.warning(f"CVE {cve_id} not found in NVD")
-        except Exception as e:
-            logger.error(f"Failed to enrich with {cve_id}: {e}")
         
         return enriched
     
-    def enrich_findings(self, findings: List[Dict]) -> List[Dict]:
-        """Enrich multiple findings"""
-        return [self.enrich_finding(f) for f in findings]
-    
     def search(
         self,
         keyword: Optional[str] = None,
@@ -256,6 +416,7 @@ class CVEService:
                     cpe += f":{version}"
                 params["cpeName"] = cpe
             
+            self._limiter.acquire()
             response = self.session.get(self.base_url, params=params, timeout=10)
             response.raise_for_status()
             
@@ -0,0 +1,13 @@
+"""
+Shared test configuration for the brain service
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def unsubscribe_secret():
+    """Provide the signing key EmailService refuses to start without"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("UNSUBSCRIBE_SECRET", "test-unsubscribe-secret")
+        yield
@@ -64,6 +64,41 @@ class TestCVELookup:
         with pytest.raises(VulnerabilityNotFound):
             service.lookup("CVE-9999-0000")
     
+    @patch.object(CVEService, '_fetch_from_nvd')
+    def test_malformed_cve_id_skips_network(self, mock_fetch):
+        """Should reject malformed CVE IDs without calling NVD"""
+        service = CVEService()
+        
+        for bad_id in ["CVE-24-1234", "CVE-2024-12", "2024-1234", ""]:
+            with pytest.raises(VulnerabilityNotFound):
+                service.lookup(bad_id)
+        
+        mock_fetch.assert_not_called()
+    
+    @patch.object(CVEService, '_fetch_from_nvd')
+    def test_lookup_normalizes_cve_id(self, mock_fetch, sample_cve_data):
+        """Should accept lowercase or padded CVE IDs and query NVD in canonical form"""
+        mock_fetch.return_value = sample_cve_data
+        service = CVEService()
+        
+        cve = service.lookup(" cve-2024-1234 ")
+        
+        assert cve.cve_id == "CVE-2024-1234"
+        mock_fetch.assert_called_once_with("CVE-2024-1234")
+    
+    @patch.object(CVEService, '_fetch_from_nvd')
+    def test_case_variants_share_one_fetch(self, mock_fetch, sample_cve_data):
+        """Should cache by canonical ID so case variants don't refetch"""
+        mock_fetch.return_value = sample_cve_data
+        service = CVEService()
+        
+        service.lookup("cve-2024-1234")
+        service.lookup("CVE-2024-1234")
+        results = service.lookup_many(["cve-2024-1234", " CVE-2024-1234"])
+        
+        assert list(results) == ["CVE-2024-1234"]
+        mock_fetch.assert_called_once_with("CVE-2024-1234")
+    
     @patch('requests.get')
     def test_cache_cve_results(self, mock_get):
         """Should cache CVE lookups to reduce API calls"""
@@ -89,6 +124,31 @@ class TestCVELookup:
         # API should only be called once
         assert mock_get.call_count == 1
         assert cve1.cve_id == cve2.cve_id
+    
+    def test_persistent_cache_survives_new_service(self, tmp_path, sample_cve_data):
+        """Should serve CVEs cached on disk by an earlier service instance"""
+        cache_path = str(tmp_path / "cve_cache.db")
+        
+        with patch.object(CVEService, '_fetch_from_nvd', return_value=sample_cve_data):
+            CVEService(cache_path=cache_path).lookup("CVE-2024-1234")
+        
+        with patch.object(CVEService, '_fetch_from_nvd') as mock_fetch:
+            cve = CVEService(cache_path=cache_path).lookup("CVE-2024-1234")
+        
+        mock_fetch.assert_not_called()
+        assert cve == sample_cve_data
+    
+    def test_persistent_cache_expires(self, tmp_path, sample_cve_data):
+        """Should refetch CVEs older than the cache TTL"""
+        cache_path = str(tmp_path / "cve_cache.db")
+        
+        with patch.object(CVEService, '_fetch_from_nvd', return_value=sample_cve_data):
+            CVEService(cache_path=cache_path).lookup("CVE-2024-1234")
+        
+        with patch.object(CVEService, '_fetch_from_nvd', return_value=sample_cve_data) as mock_fetch:
+            CVEService(cache_path=cache_path, cache_ttl=-1).lookup("CVE-2024-1234")
+        
+        mock_fetch.assert_called_once_with("CVE-2024-1234")
 
 
 class TestCVSSCalculation:
@@ -112,6 +172,14 @@ class TestCVSSCalculation:
         assert CVSSScore(base_score=6.0).get_severity() == "MEDIUM"
         assert CVSSScore(base_score=8.0).get_severity() == "HIGH"
         assert CVSSScore(base_score=9.5).get_severity() == "CRITICAL"
+    
+    def test_cvss_severity_band_boundaries(self):
+        """Should place scores on a band's lower bound into that band"""
+        assert CVSSScore(base_score=0.1).get_severity() == "LOW"
+        assert CVSSScore(base_score=4.0).get_severity() == "MEDIUM"
+        assert CVSSScore(base_score=7.0).get_severity() == "HIGH"
+        assert CVSSScore(base_score=9.0).get_severity() == "CRITICAL"
+        assert CVSSScore(base_score=10.0).get_severity() == "CRITICAL"
 
 
 class TestVulnerabilityEnrichment:
@@ -159,6 +227,48 @@ class TestVulnerabilityEnrichment:
         
         assert len(enriched) == 2
         assert mock_lookup.call_count == 2
+    
+    @patch.object(CVEService, 'lookup')
+    def test_enrich_findings_deduplicates_lookups(self, mock_lookup):
+        """Should look up each distinct CVE only once across findings"""
+        mock_lookup.side_effect = lambda cve_id: CVEData(
+            cve_id=cve_id,
+            description=f"Description for {cve_id}",
+            cvss_score=7.5,
+            severity="HIGH"
+        )
+        
+        service = CVEService()
+        
+        findings = [
+            {"title": "XSS on /a", "cve_id": "CVE-2024-0001"},
+            {"title": "XSS on /b", "cve_id": "CVE-2024-0001"},
+            {"title": "CSRF", "cve_id": "CVE-2024-0002"},
+            {"title": "Open port"}
+        ]
+        
+        enriched = service.enrich_findings(findings)
+        
+        assert mock_lookup.call_count == 2
+        assert [f["title"] for f in enriched] == [f["title"] for f in findings]
+        assert enriched[1]["cve_description"] == "Description for CVE-2024-0001"
+        assert "cvss_score" not in enriched[3]
+
+
+    @patch.object(CVEService, 'lookup')
+    def test_lookup_many_skips_missing(self, mock_lookup):
+        """Should return found CVEs only, fetching duplicates once"""
+        def fake_lookup(cve_id):
+            if cve_id == "CVE-2024-9999":
+                raise VulnerabilityNotFound(cve_id)
+            return CVEData(cve_id=cve_id, description="found")
+        mock_lookup.side_effect = fake_lookup
+        
+        service = CVEService()
+        results = service.lookup_many(["CVE-2024-0001", "CVE-2024-9999", "CVE-2024-0001"])
+        
+        assert list(results) == ["CVE-2024-0001"]
+        assert mock_lookup.call_count == 2
 
 
 class TestCVESearching:
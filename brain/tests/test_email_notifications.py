@@ -8,19 +8,22 @@ Testing email delivery for:
 - Trial expiration
 """
 
+import math
 import pytest
 from unittest.mock import Mock, patch, call
 from cyper_brain.notifications.email_service import (
     EmailService,
     EmailTemplate,
-    EmailDeliveryFailed
+    EmailDeliveryFailed,
+    _get_client
 )
+from cyper_brain.tools.rate_limit import TokenBucket
 
 
 class TestEmailDelivery:
     """Test basic email sending"""
     
-    @patch('sendgrid.SendGridAPIClient')
+    @patch('cyper_brain.notifications.email_service.SendGridAPIClient')
     def test_send_email_success(self, mock_sendgrid):
         """Should send email successfully"""
         mock_client = Mock()
@@ -39,6 +42,77 @@ class TestEmailDelivery:
         assert result["to"] == "user@example.com"
         mock_client.send.assert_called_once()
     
+    @patch('cyper_brain.notifications.tasks.send_email_task.delay')
+    def test_send_email_enqueued_in_async_mode(self, mock_delay):
+        """Should enqueue email for the worker in async mode"""
+        mock_delay.return_value = Mock(id="task_123")
+        
+        service = EmailService(api_key="test_key", async_mode=True)
+        
+        result = service.send_email(
+            to="user@example.com",
+            subject="Test Email",
+            html_content="<p>Test</p>"
+        )
+        
+        assert result["status"] == "queued"
+        assert result["to"] == "user@example.com"
+        mock_delay.assert_called_once_with(
+            to="user@example.com",
+            subject="Test Email",
+            html_content="<p>Test</p>",
+            from_email=service.from_email
+        )
+    
+    def test_rate_limited_send(self):
+        """Should absorb SendGrid 429s under burst instead of raising"""
+        from python_http_client.exceptions import HTTPError
+        
+        service = EmailService(api_key="test_key", limiter=TokenBucket(rate=700, capacity=700))
+        service.client = Mock()
+        throttled = HTTPError(429, "Too Many Requests", b"", {"Retry-After": "0"})
+        ok = Mock(status_code=202)
+        service.client.send.side_effect = [throttled] + [ok] * 700
+        
+        results = [
+            service.send_email(to=f"user{i}@example.com", subject="Burst", html_content="<p>x</p>")
+            for i in range(700)
+        ]
+        
+        assert all(result["status"] == "sent" for result in results)
+        assert service.client.send.call_count == 701
+    
+    @patch('cyper_brain.notifications.email_service.SendGridAPIClient')
+    def test_client_shared_per_api_key(self, mock_sendgrid):
+        """Should build one SendGrid client per API key"""
+        first = EmailService(api_key="test_key")
+        second = EmailService(api_key="test_key")
+        other = EmailService(api_key="other_key")
+        
+        assert first.client is second.client
+        assert mock_sendgrid.call_count == 2
+        assert other.client is mock_sendgrid.return_value
+    
+    @patch('cyper_brain.notifications.email_service.SendGridAPIClient')
+    def test_send_email_task_delivers_via_sendgrid(self, mock_sendgrid):
+        """Worker task should deliver through SendGrid directly"""
+        from cyper_brain.notifications.tasks import send_email_task
+        
+        mock_client = Mock()
+        mock_sendgrid.return_value = mock_client
+        mock_client.send.return_value = Mock(status_code=202)
+        
+        with patch.dict('os.environ', {"SENDGRID_API_KEY": "test_key"}):
+            result = send_email_task(
+                to="user@example.com",
+                subject="Test Email",
+                html_content="<p>Test</p>"
+            )
+        
+        assert result["status"] == "sent"
+        assert result["status_code"] == 202
+        mock_client.send.assert_called_once()
+    
     @patch('sendgrid.SendGridAPIClient')
     def test_send_email_failure(self, mock_sendgrid):
         """Should handle email delivery failure"""
@@ -59,11 +133,8 @@ class TestEmailDelivery:
 class TestScanCompletionEmails:
     """Test scan completion notifications"""
     
-    @patch.object(EmailService, 'send_email')
-    def test_send_scan_complete_notification(self, mock_send):
+    def test_send_scan_complete_notification(self, mock_send, service):
         """Should send email when scan completes"""
-        service = EmailService(api_key="test_key")
-        
         scan_data = {
             "id": "scan_123",
             "target": "example.com",
@@ -84,11 +155,8 @@ class TestScanCompletionEmails:
         assert "Scan Complete" in call_args[1]["subject"]
         assert "example.com" in call_args[1]["html_content"]
     
-    @patch.object(EmailService, 'send_email')
-    def test_scan_complete_includes_findings_summary(self, mock_send):
+    def test_scan_complete_includes_findings_summary(self, mock_send, service):
         """Should include findings count in email"""
-        service = EmailService(api_key="test_key")
-        
         scan_data = {
             "id": "scan_123",
             "target": "example.com",
@@ -109,11 +177,8 @@ class TestScanCompletionEmails:
 class TestCriticalFindingAlerts:
     """Test critical vulnerability alerts"""
     
-    @patch.object(EmailService, 'send_email')
-    def test_send_critical_finding_alert(self, mock_send):
+    def test_send_critical_finding_alert(self, mock_send, service):
         """Should send immediate alert for critical findings"""
-        service = EmailService(api_key="test_key")
-        
         finding = {
             "severity": "critical",
             "title": "SQL Injection Vulnerability",
@@ -131,11 +196,8 @@ class TestCriticalFindingAlerts:
         assert "SQL Injection" in call_args[1]["html_content"]
         assert "9.8" in call_args[1]["html_content"]
     
-    @patch.object(EmailService, 'send_email')
-    def test_only_send_for_critical_severity(self, mock_send):
+    def test_only_send_for_critical_severity(self, mock_send, service):
         """Should only send alerts for critical severity"""
-        service = EmailService(api_key="test_key")
-        
         # Low severity finding
         finding = {
             "severity": "low",
@@ -149,16 +211,25 @@ class TestCriticalFindingAlerts:
         
         # Should not send email for low severity
         mock_send.assert_not_called()
+    
+    def test_low_severity_does_not_render(self, mock_send, service):
+        """Should skip template rendering entirely for non-critical findings"""
+        with patch.object(EmailTemplate, 'render') as mock_render:
+            for severity in ("low", "medium", "high"):
+                service.notify_critical_finding(
+                    user_email="user@example.com",
+                    finding={"severity": severity, "title": "Minor Issue"}
+                )
+        
+        mock_render.assert_not_called()
+        mock_send.assert_not_called()
 
 
 class TestPaymentNotifications:
     """Test payment-related emails"""
     
-    @patch.object(EmailService, 'send_email')
-    def test_payment_success_email(self, mock_send):
+    def test_payment_success_email(self, mock_send, service):
         """Should send receipt for successful payment"""
-        service = EmailService(api_key="test_key")
-        
         payment_data = {
             "amount": 9900,  # $99.00
             "plan": "Pro",
@@ -175,11 +246,8 @@ class TestPaymentNotifications:
         assert "$99" in call_args[1]["html_content"]
         assert "invoice.example.com" in call_args[1]["html_content"]
     
-    @patch.object(EmailService, 'send_email')
-    def test_payment_failed_email(self, mock_send):
+    def test_payment_failed_email(self, mock_send, service):
         """Should notify user of payment failure"""
-        service = EmailService(api_key="test_key")
-        
         service.notify_payment_failed(
             user_email="user@example.com",
             reason="Card declined"
@@ -194,11 +262,8 @@ class TestPaymentNotifications:
 class TestTrialNotifications:
     """Test trial period notifications"""
     
-    @patch.object(EmailService, 'send_email')
-    def test_trial_ending_reminder(self, mock_send):
+    def test_trial_ending_reminder(self, mock_send, service):
         """Should send reminder 3 days before trial ends"""
-        service = EmailService(api_key="test_key")
-        
         service.notify_trial_ending(
             user_email="user@example.com",
             days_remaining=3
@@ -208,11 +273,8 @@ class TestTrialNotifications:
         assert "trial" in call_args[1]["subject"].lower()
         assert "3 days" in call_args[1]["html_content"]
     
-    @patch.object(EmailService, 'send_email')
-    def test_trial_expired_notification(self, mock_send):
+    def test_trial_expired_notification(self, mock_send, service):
         """Should notify when trial expires"""
-        service = EmailService(api_key="test_key")
-        
         service.notify_trial_expired(
             user_email="user@example.com"
         )
@@ -254,15 +316,43 @@ class TestEmailTemplates:
         assert "SQL Injection" in html
         assert "9.8" in html
         assert "Sanitize" in html
+    
+    def test_fragment_templates_match_jinja(self):
+        """Fast-path templates should render exactly what Jinja would"""
+        from cyper_brain.notifications.email_service import (
+            _ENV, _TEMPLATE_SOURCES, _TEMPLATES, _FragmentTemplate
+        )
+        
+        values = {
+            "amount": "99.00", "plan": "Pro", "period": "Monthly",
+            "invoice_url": "https://invoice.example.com/?a=1&b=2",
+            "reason": "<b>Card declined</b>", "update_payment_url": "https://x",
+            "days_remaining": 3, "upgrade_url": "https://app.example.com/upgrade"
+        }
+        fragment_names = [n for n, t in _TEMPLATES.items() if isinstance(t, _FragmentTemplate)]
+        
+        assert "payment_failed" in fragment_names
+        for name in fragment_names:
+            expected = _ENV.from_string(_TEMPLATE_SOURCES[name]).render(**values)
+            assert _TEMPLATES[name].render(**values) == expected
+    
+    def test_render_escapes_finding_values(self):
+        """Should escape markup coming from scan data"""
+        html = EmailTemplate.CRITICAL_FINDING.render(
+            severity="critical",
+            title="<script>alert(1)</script>",
+            cvss_score=9.8
+        )
+        
+        assert "<script>" not in html
+        assert "&lt;script&gt;" in html
 
 
 class TestUnsubscribe:
     """Test email unsubscribe functionality"""
     
-    def test_include_unsubscribe_link(self):
+    def test_include_unsubscribe_link(self, service):
         """Should include unsubscribe link in all emails"""
-        service = EmailService(api_key="test_key")
-        
         with patch.object(service, 'send_email') as mock_send:
             service.notify_scan_complete(
                 user_email="user@example.com",
@@ -272,6 +362,35 @@ class TestUnsubscribe:
             html = mock_send.call_args[1]["html_content"]
             assert "unsubscribe" in html.lower()
     
+    def test_unsubscribe_link_is_signed(self):
+        """Should sign unsubscribe links so they can't be forged for other users"""
+        from urllib.parse import urlparse, parse_qs
+        
+        service = EmailService(api_key="test_key")
+        
+        url = service._get_unsubscribe_url("user@example.com", "scan_notifications")
+        token = parse_qs(urlparse(url).query)["token"][0]
+        
+        assert service.verify_unsubscribe_token("user@example.com", "scan_notifications", token)
+        assert not service.verify_unsubscribe_token("other@example.com", "scan_notifications", token)
+    
+    def test_missing_unsubscribe_secret_rejected(self, monkeypatch):
+        """Should refuse to start without a signing key outside debug mode"""
+        monkeypatch.delenv("UNSUBSCRIBE_SECRET")
+        monkeypatch.delenv("DEBUG_MODE", raising=False)
+        
+        with pytest.raises(ValueError, match="UNSUBSCRIBE_SECRET"):
+            EmailService(api_key="test_key")
+    
+    def test_missing_unsubscribe_secret_allowed_in_debug_mode(self, monkeypatch):
+        """Should fall back to a per-process key when DEBUG_MODE is on"""
+        monkeypatch.delenv("UNSUBSCRIBE_SECRET")
+        monkeypatch.setenv("DEBUG_MODE", "true")
+        
+        service = EmailService(api_key="test_key")
+        
+        assert service._get_unsubscribe_url("user@example.com", "scan_notifications")
+    
     @patch('cyper_brain.notifications.email_service.db')
     def test_unsubscribe_user(self, mock_db):
         """Should mark user as unsubscribed"""
@@ -285,11 +404,8 @@ class TestUnsubscribe:
             subscribed=False
         )
     
-    @patch.object(EmailService, 'send_email')
-    def test_respect_unsubscribe_preferences(self, mock_send):
+    def test_respect_unsubscribe_preferences(self, mock_send, service):
         """Should not send if user unsubscribed"""
-        service = EmailService(api_key="test_key")
-        
         # Mock user as unsubscribed
         with patch.object(service, 'is_subscribed', return_value=False):
             service.notify_scan_complete(
@@ -299,15 +415,67 @@ class TestUnsubscribe:
             
             # Should not send email
             mock_send.assert_not_called()
+    
+    def test_opted_out_user_skips_rendering(self, mock_send):
+        """Should return before rendering for users unsubscribed from all email"""
+        service = EmailService(api_key="test_key")
+        service.load_unsubscribed(["user@example.com"])
+        
+        with patch.object(service, '_load_subscriptions', return_value={"user@example.com": False}), \
+                patch.object(EmailTemplate, 'render') as mock_render:
+            service.notify_scan_complete(
+                user_email="user@example.com",
+                scan_data={"id": "scan_123", "target": "example.com"}
+            )
+        
+        mock_render.assert_not_called()
+        mock_send.assert_not_called()
+    
+    def test_opt_out_filter_skips_lookup_for_other_users(self):
+        """Should not query preferences for users outside the opt-out filter"""
+        service = EmailService(api_key="test_key")
+        service.load_unsubscribed(["opted-out@example.com"])
+        
+        with patch.object(service, 'is_subscribed', return_value=True) as mock_subscribed:
+            assert service._opted_out("user@example.com") is False
+        
+        mock_subscribed.assert_not_called()
+    
+    def test_subscription_lookup_is_cached(self):
+        """Should hit the preference store once per user and type"""
+        service = EmailService(api_key="test_key")
+        
+        with patch.object(service, '_load_subscriptions', return_value={"user@example.com": False}) as mock_load:
+            assert service.is_subscribed("user@example.com", "scan_notifications") is False
+            assert service.is_subscribed("user@example.com", "scan_notifications") is False
+        
+        mock_load.assert_called_once()
+    
+    def test_send_batch_preloads_subscriptions(self):
+        """Should look up a batch's preferences in one call and skip unsubscribed users"""
+        service = EmailService(api_key="test_key")
+        service.client = Mock()
+        preferences = {"user1@example.com": True, "user2@example.com": False}
+        
+        with patch.object(service, '_load_subscriptions', return_value=preferences) as mock_load:
+            result = service.send_batch(
+                recipients=list(preferences),
+                subject="Test Batch",
+                html_content="<p>Test</p>",
+                email_type="scan_notifications"
+            )
+        
+        mock_load.assert_called_once()
+        assert result["sent"] == 1
 
 
 class TestBatchEmails:
     """Test sending emails in batches"""
     
-    @patch.object(EmailService, 'send_email')
-    def test_send_batch_emails(self, mock_send):
-        """Should send emails to multiple recipients"""
+    def test_send_batch_emails(self):
+        """Should send one API request per batch of recipients"""
         service = EmailService(api_key="test_key")
+        service.client = Mock()
         
         recipients = [
             "user1@example.com",
@@ -315,16 +483,61 @@ class TestBatchEmails:
             "user3@example.com"
         ]
         
-        service.send_batch(
+        result = service.send_batch(
             recipients=recipients,
             subject="Test Batch",
             html_content="<p>Test</p>"
         )
         
-        assert mock_send.call_count == 3
+        assert service.client.send.call_count == math.ceil(len(recipients) / EmailService.BATCH_SIZE)
+        assert result["sent"] == 3
+        
+        message = service.client.send.call_args[0][0].get()
+        assert len(message["personalizations"]) == 3
+    
+    def test_send_batch_chunks_large_lists(self):
+        """Should split recipients into BATCH_SIZE chunks with per-recipient substitutions"""
+        service = EmailService(api_key="test_key")
+        service.client = Mock()
+        
+        recipients = [f"user{i}@example.com" for i in range(250)]
+        
+        service.send_batch(
+            recipients=recipients,
+            subject="Test Batch",
+            html_content="<p>Hi -name-</p>",
+            substitutions={"user0@example.com": {"-name-": "Ada"}}
+        )
+        
+        assert service.client.send.call_count == 3
+        first = service.client.send.call_args_list[0][0][0].get()
+        substituted = [p for p in first["personalizations"] if p.get("substitutions")]
+        assert substituted[0]["substitutions"] == {"-name-": "Ada"}
 
 
 # Fixtures
+@pytest.fixture(autouse=True)
+def clear_sendgrid_clients():
+    """Drop cached SendGrid clients so patched constructors take effect"""
+    _get_client.cache_clear()
+    yield
+    _get_client.cache_clear()
+
+
+@pytest.fixture(scope="module")
+def service():
+    """EmailService shared by tests that don't change its state"""
+    return EmailService(api_key="test_key")
+
+
+@pytest.fixture
+def mock_send(monkeypatch):
+    """Replace EmailService.send_email with a mock for the duration of a test"""
+    mock = Mock()
+    monkeypatch.setattr(EmailService, 'send_email', mock)
+    yield mock
+
+
 @pytest.fixture
 def sample_scan_data():
     """Sample scan data for testing"""
@@ -0,0 +1,98 @@
+"""
+Tests for per-host request throttling used by the active testers
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+from cyper_brain.tools.rate_limit import HostRateLimiter
+
+
+def _response(status_code, retry_after=None):
+    response = Mock(status_code=status_code)
+    response.headers = {"Retry-After": retry_after} if retry_after else {}
+    return response
+
+
+class TestHostRateLimiter:
+    """Test per-host concurrency windows and backoff"""
+
+    def test_slot_serializes_requests_to_same_host(self):
+        """Should hold a second request to a host until the first finishes"""
+        limiter = HostRateLimiter(max_concurrency=1)
+        entered = threading.Event()
+
+        def second_request():
+            with limiter.slot("http://target.test/b"):
+                entered.set()
+
+        with limiter.slot("http://target.test/a"):
+            worker = threading.Thread(target=second_request)
+            worker.start()
+            assert not entered.wait(timeout=0.1)
+
+        assert entered.wait(timeout=1)
+        worker.join()
+
+    def test_slot_does_not_block_other_hosts(self):
+        """Should give each host its own window"""
+        limiter = HostRateLimiter(max_concurrency=1)
+        entered = threading.Event()
+
+        def other_host_request():
+            with limiter.slot("http://other.test/"):
+                entered.set()
+
+        with limiter.slot("http://target.test/"):
+            worker = threading.Thread(target=other_host_request)
+            worker.start()
+            assert entered.wait(timeout=1)
+        worker.join()
+
+    def test_throttle_halves_window_and_success_widens_it(self):
+        """Should shrink the window on 429 and grow it back one slot per success"""
+        limiter = HostRateLimiter(max_concurrency=8, default_backoff=0)
+        url = "http://target.test/"
+
+        assert limiter.record(url, 429) is True
+        assert limiter.limit_for(url) == 4
+        assert limiter.limit_for("http://other.test/") == 8
+
+        assert limiter.record(url, 200) is False
+        assert limiter.limit_for(url) == 5
+
+    def test_retry_after_pauses_host(self):
+        """Should not hand out a slot before the Retry-After interval passes"""
+        limiter = HostRateLimiter()
+        url = "http://target.test/"
+        limiter.record(url, 503, retry_after="0.2")
+
+        start = time.monotonic()
+        with limiter.slot(url):
+            pass
+
+        assert time.monotonic() - start >= 0.15
+
+    @patch("cyper_brain.tools.rate_limit.requests.request")
+    def test_request_retries_throttled_responses(self, mock_request):
+        """Should retry a throttled request and return the first unthrottled response"""
+        mock_request.side_effect = [_response(429, "0"), _response(200)]
+        limiter = HostRateLimiter()
+
+        response = limiter.request("GET", "http://target.test/", timeout=5)
+
+        assert response.status_code == 200
+        assert mock_request.call_count == 2
+        mock_request.assert_called_with("GET", "http://target.test/", timeout=5)
+
+    @patch("cyper_brain.tools.rate_limit.requests.request")
+    def test_request_gives_up_after_max_retries(self, mock_request):
+        """Should return the last throttled response once retries run out"""
+        mock_request.return_value = _response(429, "0")
+        limiter = HostRateLimiter()
+
+        response = limiter.request("GET", "http://target.test/", max_retries=1)
+
+        assert response.status_code == 429
+        assert mock_request.call_count == 2
@@ -31,6 +31,26 @@ class TestZAPScannerInitialization:
         """Should use default ZAP URL if not specified"""
         scanner = ZAPScanner()
         assert "localhost" in scanner.zap_url or "127.0.0.1" in scanner.zap_url
+    
+    def test_actions_are_never_retried(self):
+        """Action calls should use the session without retries; views may retry"""
+        scanner = ZAPScanner(api_key="test_key")
+        scanner.zap._session.request = Mock(return_value=Mock(status_code=200))
+        scanner.zap._action_session.request = Mock(return_value=Mock(status_code=200))
+        
+        scanner.zap._request_api("http://zap/JSON/ascan/action/scan/", {"url": "http://t"})
+        scanner.zap._request_api("http://zap/JSON/ascan/view/status/", {"scanId": "1"})
+        
+        scanner.zap._action_session.request.assert_called_once()
+        scanner.zap._session.request.assert_called_once()
+        assert scanner.zap._action_session.get_adapter("http://zap/").max_retries.total == 0
+    
+    def test_non_zap_url_rejected(self):
+        """Should refuse to send the API key anywhere but ZAP"""
+        scanner = ZAPScanner(api_key="test_key")
+        
+        with pytest.raises(ValueError):
+            scanner.zap._request_api("http://example.com/JSON/core/view/version/")
 
 
 class TestSpiderScan:
@@ -61,6 +81,20 @@ class TestSpiderScan:
         scanner.wait_for_spider("scan_id", max_wait=5)
         
         assert mock_spider.status.call_count >= 1
+    
+    @patch('cyper_brain.scanners.zap_scanner.time.sleep')
+    def test_wait_for_spider_backoff(self, mock_sleep):
+        """Should poll on a growing interval until the spider finishes"""
+        scanner = ZAPScanner()
+        scanner.zap = Mock()
+        scanner.zap.spider.status.side_effect = ["0", "0", "0", "100"]
+        
+        scanner.wait_for_spider("scan_id", max_wait=5)
+        
+        assert scanner.zap.spider.status.call_count == 4
+        delays = [c[0][0] for c in mock_sleep.call_args_list]
+        assert delays == sorted(delays)
+        assert sum(delays) < 1.0
 
 
 class TestActiveScan:
@@ -139,6 +173,19 @@ class TestVulnerabilityDetection:
         
         assert len(high_vulns) == 1
         assert high_vulns[0].title == "Critical Issue"
+    
+    def test_vulnerabilities_carry_risk_rank(self):
+        """Should rank severities numerically for filtering and sorting"""
+        alerts = [
+            {"alert": "Info Leak", "risk": "Informational"},
+            {"alert": "SQL Injection", "risk": "High"},
+            {"alert": "Missing Header", "risk": "Low"}
+        ]
+        
+        vulns = ZAPScanner._alerts_to_vulnerabilities(alerts, min_risk="Low")
+        ranked = sorted(vulns, key=lambda v: v.risk_rank, reverse=True)
+        
+        assert [v.title for v in ranked] == ["SQL Injection", "Missing Header"]
 
 
 class TestOWASPMapping:
@@ -209,6 +256,31 @@ class TestScanWorkflow:
         assert result.target == "https://example.com"
         mock_spider.scan.assert_called_once()
         mock_ascan.scan.assert_called_once()
+    
+    def test_scan_many_targets_concurrently(self):
+        """Should scan each target and scope alerts to it"""
+        responses = {
+            "/JSON/spider/action/scan/": {"scan": "1"},
+            "/JSON/spider/view/status/": {"status": "100"},
+            "/JSON/core/view/urls/": {"urls": ["a", "b"]},
+            "/JSON/ascan/action/scan/": {"scan": "2"},
+            "/JSON/ascan/view/status/": {"status": "100"},
+        }
+        
+        async def fake_api_get(session, path, **params):
+            if path == "/JSON/core/view/alerts/":
+                return {"alerts": [{"alert": f"XSS on {params['baseurl']}", "risk": "Medium"}]}
+            return responses[path]
+        
+        scanner = ZAPScanner()
+        targets = ["https://a.example.com", "https://b.example.com"]
+        
+        with patch.object(scanner, '_api_get', side_effect=fake_api_get):
+            results = scanner.scan_targets(targets, concurrency=2)
+        
+        assert [r.target for r in results] == targets
+        assert results[1].vulnerabilities[0].title == "XSS on https://b.example.com"
+        assert results[0].pages_crawled == 2
 
 
 class TestReportGeneration:
@@ -227,6 +299,24 @@ class TestReportGeneration:
         assert "<html>" in html
         assert "Report" in html
     
+    def test_stream_html_report_to_file(self):
+        """Should stream the report into a file object in chunks"""
+        import io
+        
+        scanner = ZAPScanner()
+        scanner.zap = Mock()
+        scanner.session = MagicMock()
+        response = scanner.session.get.return_value.__enter__.return_value
+        response.iter_content.return_value = [b"<html>", b"Report", b"</html>"]
+        
+        out = io.BytesIO()
+        written = scanner.generate_html_report(out)
+        
+        assert out.getvalue() == b"<html>Report</html>"
+        assert written == len(out.getvalue())
+        assert scanner.session.get.call_args[1]["stream"] is True
+        scanner.zap.core.htmlreport.assert_not_called()
+    
     @patch('zapv2.ZAPv2')
     def test_export_json_results(self, mock_zap):
         """Should export results as JSON"""
@@ -249,6 +339,9 @@ class TestReportGeneration:
         assert json_data["target"] == "https://example.com"
         assert len(json_data["vulnerabilities"]) == 1
         assert json_data["vulnerabilities"][0]["title"] == "XSS"
+        
+        import json
+        assert json.loads(result.to_json_bytes()) == json_data
 
 
 class TestErrorHandling:
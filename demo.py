@@ -8,8 +8,6 @@ Perfect for showcasing the platform to stakeholders and potential customers.
 
 import time
 import sys
-from datetime import datetime
-from typing import Dict, Any
 
 # Color codes for terminal output
 class Colors:
@@ -24,71 +22,162 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
+# ANSI fragments for the print helpers, built once instead of on every call
+_SUCCESS_PREFIX = f"{Colors.GREEN}✓ "
+_INFO_PREFIX = f"{Colors.YELLOW}ℹ "
+_FEATURE_PREFIX = f"  {Colors.GREEN}✓{Colors.END} {Colors.BOLD}"
+_FEATURE_MID = f"{Colors.END} - {Colors.CYAN}"
+_BAR = "=" * 80
+_HEADER_TOP = f"\n{Colors.BOLD}{Colors.BLUE}{_BAR}{Colors.END}\n{Colors.BOLD}{Colors.HEADER}"
+_HEADER_BOT = f"{Colors.END}\n{Colors.BOLD}{Colors.BLUE}{_BAR}{Colors.END}\n\n"
+_SECTION_PREFIX = f"\n{Colors.BOLD}{Colors.CYAN}▶ "
+
+# Playback settings, overridden from the command line in main()
+PACE = 1.0  # Multiplier for every pause and typing delay; 0 disables them
+INTERACTIVE = True  # Wait for Enter between parts of the demo
+
+
+def format_header(text: str) -> str:
+    """Section header as printed by print_header"""
+    return _HEADER_TOP + text.center(80) + _HEADER_BOT
+
+
+def format_section(title: str) -> str:
+    """Subsection title as printed by print_section"""
+    return _SECTION_PREFIX + title + Colors.END + "\n"
+
+
+def format_success(text: str) -> str:
+    """Success line as printed by print_success"""
+    return _SUCCESS_PREFIX + text + Colors.END + "\n"
+
+
+def format_info(text: str) -> str:
+    """Info line as printed by print_info"""
+    return _INFO_PREFIX + text + Colors.END + "\n"
+
+
+def format_feature(name: str, status: str = "IMPLEMENTED") -> str:
+    """Feature line as printed by print_feature"""
+    return "".join((_FEATURE_PREFIX, name, _FEATURE_MID, status, Colors.END, "\n"))
+
+
 def print_header(text: str):
     """Print section header"""
-    print(f"\n{Colors.BOLD}{Colors.BLUE}{'='*80}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.HEADER}{text.center(80)}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{'='*80}{Colors.END}\n")
+    sys.stdout.write(format_header(text))
 
 
 def print_section(title: str):
     """Print subsection title"""
-    print(f"\n{Colors.BOLD}{Colors.CYAN}▶ {title}{Colors.END}")
+    sys.stdout.write(format_section(title))
 
 
 def print_success(text: str):
     """Print success message"""
-    print(f"{Colors.GREEN}✓ {text}{Colors.END}")
+    sys.stdout.write(format_success(text))
 
 
 def print_info(text: str):
     """Print info message"""
-    print(f"{Colors.YELLOW}ℹ {text}{Colors.END}")
+    sys.stdout.write(format_info(text))
 
 
 def print_feature(name: str, status: str = "IMPLEMENTED"):
     """Print feature status"""
-    print(f"  {Colors.GREEN}✓{Colors.END} {Colors.BOLD}{name}{Colors.END} - {Colors.CYAN}{status}{Colors.END}")
-
-
-def simulate_typing(text: str, delay: float = 0.03):
-    """Simulate typing effect"""
-    for char in text:
-        sys.stdout.write(char)
-        sys.stdout.flush()
-        time.sleep(delay)
-    print()
+    sys.stdout.write(format_feature(name, status))
+
+
+def pause(seconds: float):
+    """Sleep for ``seconds`` scaled by PACE"""
+    if PACE > 0:
+        time.sleep(seconds * PACE)
+
+
+def wait_for_user(prompt: str):
+    """Wait for Enter, or just pause briefly when running unattended"""
+    if INTERACTIVE:
+        input(f"\n{Colors.YELLOW}{prompt}{Colors.END} ")
+    else:
+        pause(0.5)
+
+
+def simulate_typing(text: str, delay: float = 0.03, chunk: int = 4):
+    """Simulate typing effect, emitting a few characters per write"""
+    write = sys.stdout.write
+    flush = sys.stdout.flush
+    delay *= PACE
+    if delay <= 0:
+        write(text + "\n")
+        return
+    # Pace against a monotonic deadline so sleep jitter doesn't accumulate
+    deadline = time.monotonic()
+    for i in range(0, len(text), chunk):
+        write(text[i:i + chunk])
+        flush()
+        deadline += delay * chunk
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+    write("\n")
+
+
+# Static parts of each demo section, assembled once so every run of lines
+# between pauses goes out in a single write
+
+_INTRODUCTION_1 = (
+    format_header("🛡️  CyperSecurity Agent Platform Demo")
+    + f"{Colors.BOLD}Welcome to the CyperSecurity Platform!{Colors.END}\n\n"
+    + "An AI-powered automated security testing platform that helps\n"
+    + "security teams discover vulnerabilities before attackers do.\n\n"
+)
+_INTRODUCTION_2 = (
+    format_info("Platform Status: 100% PRODUCTION READY")
+    + format_info("Test Coverage: 115+ comprehensive tests")
+    + format_info("Features: 20 major features across all phases")
+    + format_info("Documentation: Complete (User Guide, API Docs, Knowledge Base)")
+)
 
 
 def demo_introduction():
     """Demonstrate platform introduction"""
-    print_header("🛡️  CyperSecurity Agent Platform Demo")
-    
-    print(f"{Colors.BOLD}Welcome to the CyperSecurity Platform!{Colors.END}\n")
-    print("An AI-powered automated security testing platform that helps")
-    print("security teams discover vulnerabilities before attackers do.\n")
-    
-    time.sleep(1)
-    
-    print_info("Platform Status: 100% PRODUCTION READY")
-    print_info("Test Coverage: 115+ comprehensive tests")
-    print_info("Features: 20 major features across all phases")
-    print_info("Documentation: Complete (User Guide, API Docs, Knowledge Base)")
-    
-    time.sleep(2)
+    sys.stdout.write(_INTRODUCTION_1)
+    
+    pause(1)
+    
+    sys.stdout.write(_INTRODUCTION_2)
+    
+    pause(2)
+
+
+_CORE_FEATURES_1 = (
+    format_header("Phase 1: Core Scanning Capabilities (P0)")
+    + format_section("1. Network Scanning with Nmap")
+    + "Discovers open ports, running services, and operating systems\n"
+    + format_feature("Port Scanning", "18 tests")
+    + format_feature("Service Detection", "Version identification")
+    + format_feature("OS Fingerprinting", "Platform detection")
+)
+_CORE_FEATURES_2 = (
+    format_section("2. Web Application Scanning with OWASP ZAP")
+    + "Tests web applications for OWASP Top 10 vulnerabilities\n"
+    + format_feature("Website Spidering", "14 tests")
+    + format_feature("Active Scanning", "Vulnerability detection")
+    + format_feature("OWASP Top 10 2021", "Complete coverage")
+)
+_CORE_FEATURES_3 = (
+    format_section("3. SQL Injection Testing with SQLMap")
+    + "Automated detection and exploitation of SQL injection flaws\n"
+    + format_feature("Injection Detection", "13 tests")
+    + format_feature("Database Fingerprinting", "MySQL, PostgreSQL, MSSQL")
+    + format_feature("Data Extraction", "Databases and tables")
+)
 
 
 def demo_core_features():
     """Demonstrate core scanning features"""
-    print_header("Phase 1: Core Scanning Capabilities (P0)")
-    
-    print_section("1. Network Scanning with Nmap")
-    print("Discovers open ports, running services, and operating systems")
-    print_feature("Port Scanning", "18 tests")
-    print_feature("Service Detection", "Version identification")
-    print_feature("OS Fingerprinting", "Platform detection")
+    sys.stdout.write(_CORE_FEATURES_1)
     
-    time.sleep(1.5)
+    pause(1.5)
     
     print("\n📊 Sample Scan Output:")
     simulate_typing("  Target: scanme.nmap.org", 0.02)
@@ -96,160 +185,193 @@ def demo_core_features():
     simulate_typing("  Services: OpenSSH 7.4, Apache 2.4.41", 0.02)
     simulate_typing("  OS: Linux 3.x", 0.02)
     
-    time.sleep(1)
+    pause(1)
     
-    print_section("2. Web Application Scanning with OWASP ZAP")
-    print("Tests web applications for OWASP Top 10 vulnerabilities")
-    print_feature("Website Spidering", "14 tests")
-    print_feature("Active Scanning", "Vulnerability detection")
-    print_feature("OWASP Top 10 2021", "Complete coverage")
+    sys.stdout.write(_CORE_FEATURES_2)
     
-    time.sleep(1.5)
+    pause(1.5)
     
     print("\n🔍 Sample Vulnerabilities Found:")
     simulate_typing("  HIGH: SQL Injection in /api/login", 0.02)
     simulate_typing("  MEDIUM: Cross-Site Scripting (XSS) in /search", 0.02)
     simulate_typing("  LOW: Missing Security Headers", 0.02)
     
-    time.sleep(1)
-    
-    print_section("3. SQL Injection Testing with SQLMap")
-    print("Automated detection and exploitation of SQL injection flaws")
-    print_feature("Injection Detection", "13 tests")
-    print_feature("Database Fingerprinting", "MySQL, PostgreSQL, MSSQL")
-    print_feature("Data Extraction", "Databases and tables")
-    
-    time.sleep(1.5)
+    pause(1)
+    
+    sys.stdout.write(_CORE_FEATURES_3)
+    
+    pause(1.5)
+
+
+_INTELLIGENCE_1 = (
+    format_header("Phase 2: Vulnerability Intelligence (P0)")
+    + format_section("1. CVE/NVD Integration")
+    + "Real-time vulnerability data from National Vulnerability Database\n"
+    + format_feature("CVE Lookup", "12 tests")
+    + format_feature("CISA KEV Check", "Known Exploited Vulnerabilities")
+    + format_feature("Finding Enrichment", "Automatic CVE mapping")
+)
+_INTELLIGENCE_2 = (
+    format_section("2. CVSS v3.1 Score Calculator")
+    + "Calculates severity scores per CVSS specification\n"
+    + format_feature("Base Score Calculation", "15 tests")
+    + format_feature("Vector String Parsing", "CVSS:3.1/AV:N/AC:L/...")
+    + format_feature("Severity Mapping", "NONE → CRITICAL")
+)
+_INTELLIGENCE_3 = (
+    format_section("3. MITRE ATT&CK Mapping")
+    + "Maps findings to adversary tactics and techniques\n"
+    + format_feature("14 Tactics", "Reconnaissance → Impact")
+    + format_feature("6 Techniques", "T1190, T1189, T1110, etc.")
+    + format_feature("Remediation Guidance", "Tactical recommendations")
+)
 
 
 def demo_intelligence():
     """Demonstrate vulnerability intelligence"""
-    print_header("Phase 2: Vulnerability Intelligence (P0)")
-    
-    print_section("1. CVE/NVD Integration")
-    print("Real-time vulnerability data from National Vulnerability Database")
-    print_feature("CVE Lookup", "12 tests")
-    print_feature("CISA KEV Check", "Known Exploited Vulnerabilities")
-    print_feature("Finding Enrichment", "Automatic CVE mapping")
+    sys.stdout.write(_INTELLIGENCE_1)
     
-    time.sleep(1.5)
+    pause(1.5)
     
     print("\n📋 Sample CVE Data:")
     simulate_typing("  CVE-2024-1234: SQL Injection in Apache Struts", 0.02)
     simulate_typing("  CVSS Score: 9.8 (CRITICAL)", 0.02)
     simulate_typing("  CISA KEV: ✓ Actively Exploited", 0.02)
     
-    time.sleep(1)
+    pause(1)
     
-    print_section("2. CVSS v3.1 Score Calculator")
-    print("Calculates severity scores per CVSS specification")
-    print_feature("Base Score Calculation", "15 tests")
-    print_feature("Vector String Parsing", "CVSS:3.1/AV:N/AC:L/...")
-    print_feature("Severity Mapping", "NONE → CRITICAL")
+    sys.stdout.write(_INTELLIGENCE_2)
     
-    time.sleep(1)
+    pause(1)
     
-    print_section("3. MITRE ATT&CK Mapping")
-    print("Maps findings to adversary tactics and techniques")
-    print_feature("14 Tactics", "Reconnaissance → Impact")
-    print_feature("6 Techniques", "T1190, T1189, T1110, etc.")
-    print_feature("Remediation Guidance", "Tactical recommendations")
+    sys.stdout.write(_INTELLIGENCE_3)
     
-    time.sleep(1.5)
+    pause(1.5)
+
+
+_BILLING_1 = (
+    format_header("Phase 3: Monetization & Billing (P0)")
+    + format_section("Stripe Integration")
+    + "Complete subscription and payment processing\n"
+    + format_feature("Subscription Management", "15 tests")
+    + format_feature("Usage Metering", "Scan quota tracking")
+    + format_feature("Invoice Generation", "Automatic billing")
+)
+_BILLING_2 = (
+    "\n💰 Pricing Tiers:\n"
+    + f"  {Colors.BOLD}FREE{Colors.END}        - $0/month   - 100 scans/month\n"
+    + f"  {Colors.BOLD}PRO{Colors.END}         - $99/month  - 1,000 scans/month\n"
+    + f"  {Colors.BOLD}ENTERPRISE{Colors.END}  - Custom     - Unlimited scans\n"
+)
 
 
 def demo_billing():
     """Demonstrate monetization"""
-    print_header("Phase 3: Monetization & Billing (P0)")
-    
-    print_section("Stripe Integration")
-    print("Complete subscription and payment processing")
-    print_feature("Subscription Management", "15 tests")
-    print_feature("Usage Metering", "Scan quota tracking")
-    print_feature("Invoice Generation", "Automatic billing")
+    sys.stdout.write(_BILLING_1)
     
-    time.sleep(1.5)
+    pause(1.5)
     
-    print("\n💰 Pricing Tiers:")
-    print(f"  {Colors.BOLD}FREE{Colors.END}        - $0/month   - 100 scans/month")
-    print(f"  {Colors.BOLD}PRO{Colors.END}         - $99/month  - 1,000 scans/month")
-    print(f"  {Colors.BOLD}ENTERPRISE{Colors.END}  - Custom     - Unlimited scans")
+    sys.stdout.write(_BILLING_2)
     
-    time.sleep(1.5)
+    pause(1.5)
     
     print("\n🎁 14-Day Free Trial: Automatic Pro plan activation")
     
-    time.sleep(1)
+    pause(1)
+
+
+_INTEGRATIONS_1 = (
+    format_header("Phase 4: User Experience & Integrations (P1)")
+    + format_section("1. Webhook System")
+    + "Real-time event notifications with retry logic\n"
+    + format_feature("8 Event Types", "scan.completed, critical.finding, etc.")
+    + format_feature("HMAC Verification", "SHA-256 signatures")
+    + format_feature("Retry Logic", "Exponential backoff")
+)
+_INTEGRATIONS_2 = (
+    format_section("2. Multi-Channel Notifications")
+    + format_feature("Slack Integration", "Rich Block Kit messages")
+    + format_feature("Discord Integration", "Webhook embeds")
+    + format_feature("PagerDuty Integration", "Incident creation")
+    + format_feature("Email Notifications", "12 tests - SendGrid")
+)
+_INTEGRATIONS_3 = (
+    format_section("3. Onboarding Flow")
+    + format_feature("Email Verification", "Secure token-based")
+    + format_feature("4-Step Wizard", "Welcome → Org → Team → Trial")
+    + format_feature("Trial Activation", "14-day Pro access")
+)
 
 
 def demo_integrations():
     """Demonstrate integrations"""
-    print_header("Phase 4: User Experience & Integrations (P1)")
+    sys.stdout.write(_INTEGRATIONS_1)
     
-    print_section("1. Webhook System")
-    print("Real-time event notifications with retry logic")
-    print_feature("8 Event Types", "scan.completed, critical.finding, etc.")
-    print_feature("HMAC Verification", "SHA-256 signatures")
-    print_feature("Retry Logic", "Exponential backoff")
+    pause(1)
     
-    time.sleep(1)
+    sys.stdout.write(_INTEGRATIONS_2)
     
-    print_section("2. Multi-Channel Notifications")
-    print_feature("Slack Integration", "Rich Block Kit messages")
-    print_feature("Discord Integration", "Webhook embeds")
-    print_feature("PagerDuty Integration", "Incident creation")
-    print_feature("Email Notifications", "12 tests - SendGrid")
+    pause(1.5)
     
-    time.sleep(1.5)
+    sys.stdout.write(_INTEGRATIONS_3)
     
-    print_section("3. Onboarding Flow")
-    print_feature("Email Verification", "Secure token-based")
-    print_feature("4-Step Wizard", "Welcome → Org → Team → Trial")
-    print_feature("Trial Activation", "14-day Pro access")
-    
-    time.sleep(1.5)
+    pause(1.5)
+
+
+_QUALITY_1 = (
+    format_header("Phase 5: Quality & Reliability (P1)")
+    + format_section("1. CI/CD Pipeline (GitHub Actions)")
+    + format_feature("Automated Testing", "Python + Go test suites")
+    + format_feature("Security Scanning", "Trivy vulnerability detection")
+    + format_feature("Docker Builds", "Optimized image creation")
+    + format_feature("Staging Deployment", "Automatic on main branch")
+    + format_feature("Production Deployment", "Release-triggered")
+)
+_QUALITY_2 = (
+    format_section("2. E2E Testing (Playwright)")
+    + format_feature("User Onboarding Tests", "10+ scenarios")
+    + format_feature("Scan Workflow Tests", "Full journey validation")
+    + format_feature("Integration Tests", "Cross-module verification")
+)
+_QUALITY_3 = (
+    "\n📊 Quality Metrics:\n"
+    + f"  Test Coverage: {Colors.GREEN}115+ tests{Colors.END}\n"
+    + f"  Code Quality: {Colors.GREEN}TDD methodology{Colors.END}\n"
+    + f"  Security: {Colors.GREEN}Automated scanning{Colors.END}\n"
+)
 
 
 def demo_quality():
     """Demonstrate quality infrastructure"""
-    print_header("Phase 5: Quality & Reliability (P1)")
+    sys.stdout.write(_QUALITY_1)
     
-    print_section("1. CI/CD Pipeline (GitHub Actions)")
-    print_feature("Automated Testing", "Python + Go test suites")
-    print_feature("Security Scanning", "Trivy vulnerability detection")
-    print_feature("Docker Builds", "Optimized image creation")
-    print_feature("Staging Deployment", "Automatic on main branch")
-    print_feature("Production Deployment", "Release-triggered")
+    pause(1.5)
     
-    time.sleep(1.5)
+    sys.stdout.write(_QUALITY_2)
     
-    print_section("2. E2E Testing (Playwright)")
-    print_feature("User Onboarding Tests", "10+ scenarios")
-    print_feature("Scan Workflow Tests", "Full journey validation")
-    print_feature("Integration Tests", "Cross-module verification")
+    pause(1.5)
     
-    time.sleep(1.5)
+    sys.stdout.write(_QUALITY_3)
     
-    print("\n📊 Quality Metrics:")
-    print(f"  Test Coverage: {Colors.GREEN}115+ tests{Colors.END}")
-    print(f"  Code Quality: {Colors.GREEN}TDD methodology{Colors.END}")
-    print(f"  Security: {Colors.GREEN}Automated scanning{Colors.END}")
-    
-    time.sleep(1)
+    pause(1)
+
+
+_ANALYTICS = (
+    format_header("Phase 6: Analytics & Optimization (P2)")
+    + format_section("Product Analytics")
+    + format_feature("Event Tracking", "6 categories, session tracking")
+    + format_feature("KPI Metrics", "DAU/WAU/MAU tracking")
+    + format_feature("Conversion Funnel", "Signup → Paid analysis")
+    + format_feature("Retention Analysis", "7-day & 30-day cohorts")
+    + format_feature("Feature Adoption", "Usage rate per feature")
+)
 
 
 def demo_analytics():
     """Demonstrate analytics"""
-    print_header("Phase 6: Analytics & Optimization (P2)")
+    sys.stdout.write(_ANALYTICS)
     
-    print_section("Product Analytics")
-    print_feature("Event Tracking", "6 categories, session tracking")
-    print_feature("KPI Metrics", "DAU/WAU/MAU tracking")
-    print_feature("Conversion Funnel", "Signup → Paid analysis")
-    print_feature("Retention Analysis", "7-day & 30-day cohorts")
-    print_feature("Feature Adoption", "Usage rate per feature")
-    
-    time.sleep(1.5)
+    pause(1.5)
     
     print("\n📈 Sample Analytics:")
     simulate_typing("  Daily Active Users (DAU): 247", 0.02)
@@ -258,143 +380,189 @@ def demo_analytics():
     simulate_typing("  Stickiness Ratio: 7.1% (DAU/MAU)", 0.02)
     simulate_typing("  7-Day Retention: 68%", 0.02)
     
-    time.sleep(1.5)
+    pause(1.5)
+
+
+_DOCUMENTATION = (
+    format_header("Documentation & Support")
+    + format_section("Complete Documentation Suite")
+    + format_feature("USER_GUIDE.md", "Getting started, tutorials")
+    + format_feature("API_DOCUMENTATION.md", "REST API reference")
+    + format_feature("KNOWLEDGE_BASE.md", "Workflows, troubleshooting")
+    + format_feature("CI_CD.md", "Pipeline documentation")
+)
 
 
 def demo_documentation():
     """Demonstrate documentation"""
-    print_header("Documentation & Support")
-    
-    print_section("Complete Documentation Suite")
-    print_feature("USER_GUIDE.md", "Getting started, tutorials")
-    print_feature("API_DOCUMENTATION.md", "REST API reference")
-    print_feature("KNOWLEDGE_BASE.md", "Workflows, troubleshooting")
-    print_feature("CI_CD.md", "Pipeline documentation")
-    
-    time.sleep(1.5)
+    sys.stdout.write(_DOCUMENTATION)
+    
+    pause(1.5)
+
+
+_SUMMARY_1 = (
+    format_header("🎉 Platform Summary")
+    + f"\n{Colors.BOLD}Complete Feature Set:{Colors.END}\n"
+    + f"  • {Colors.GREEN}20 major features{Colors.END} implemented\n"
+    + f"  • {Colors.GREEN}115+ comprehensive tests{Colors.END}\n"
+    + f"  • {Colors.GREEN}100% phase completion{Colors.END} (P0 + P1 + P2)\n"
+    + f"  • {Colors.GREEN}Enterprise-grade{Colors.END} infrastructure\n"
+    + f"  • {Colors.GREEN}Production-ready{Colors.END} deployment\n"
+)
+_SUMMARY_2 = (
+    f"\n{Colors.BOLD}Technology Stack:{Colors.END}\n"
+    + "  • Python (AI, Scanning, Analytics)\n"
+    + "  • Go (API Gateway, RBAC)\n"
+    + "  • React (Dashboard UI)\n"
+    + "  • PostgreSQL (Multi-tenant DB)\n"
+    + "  • Kubernetes (Orchestration)\n"
+)
+_SUMMARY_3 = (
+    f"\n{Colors.BOLD}Revenue Model:{Colors.END}\n"
+    + "  • Free: $0/mo (100 scans)\n"
+    + "  • Pro: $99/mo (1,000 scans)\n"
+    + "  • Enterprise: Custom (unlimited)\n"
+)
+_SUMMARY_4 = (
+    f"\n{Colors.BOLD}{Colors.GREEN}✓ PLATFORM IS 100% PRODUCTION READY{Colors.END}\n"
+    + f"{Colors.BOLD}{Colors.GREEN}✓ READY FOR BETA LAUNCH{Colors.END}\n\n"
+)
 
 
 def demo_summary():
     """Demonstrate platform summary"""
-    print_header("🎉 Platform Summary")
-    
-    print(f"\n{Colors.BOLD}Complete Feature Set:{Colors.END}")
-    print(f"  • {Colors.GREEN}20 major features{Colors.END} implemented")
-    print(f"  • {Colors.GREEN}115+ comprehensive tests{Colors.END}")
-    print(f"  • {Colors.GREEN}100% phase completion{Colors.END} (P0 + P1 + P2)")
-    print(f"  • {Colors.GREEN}Enterprise-grade{Colors.END} infrastructure")
-    print(f"  • {Colors.GREEN}Production-ready{Colors.END} deployment")
+    sys.stdout.write(_SUMMARY_1)
     
-    time.sleep(1)
+    pause(1)
     
-    print(f"\n{Colors.BOLD}Technology Stack:{Colors.END}")
-    print("  • Python (AI, Scanning, Analytics)")
-    print("  • Go (API Gateway, RBAC)")
-    print("  • React (Dashboard UI)")
-    print("  • PostgreSQL (Multi-tenant DB)")
-    print("  • Kubernetes (Orchestration)")
+    sys.stdout.write(_SUMMARY_2)
     
-    time.sleep(1)
+    pause(1)
     
-    print(f"\n{Colors.BOLD}Revenue Model:{Colors.END}")
-    print("  • Free: $0/mo (100 scans)")
-    print("  • Pro: $99/mo (1,000 scans)")
-    print("  • Enterprise: Custom (unlimited)")
+    sys.stdout.write(_SUMMARY_3)
     
-    time.sleep(1)
+    pause(1)
     
-    print(f"\n{Colors.BOLD}{Colors.GREEN}✓ PLATFORM IS 100% PRODUCTION READY{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.GREEN}✓ READY FOR BETA LAUNCH{Colors.END}\n")
+    sys.stdout.write(_SUMMARY_4)
     
-    time.sleep(2)
+    pause(2)
+
+
+_LIVE_EXAMPLE = (
+    format_header("🎬 Live Platform Demo")
+    + format_section("Scenario: Security Team Running Daily Scan")
+)
 
 
 def demo_live_example():
     """Simulate live platform usage"""
-    print_header("🎬 Live Platform Demo")
-    
-    print_section("Scenario: Security Team Running Daily Scan")
-    time.sleep(1)
+    sys.stdout.write(_LIVE_EXAMPLE)
+    pause(1)
     
     print("\n1️⃣  User logs in...")
     simulate_typing("   → Authentication successful", 0.02)
     simulate_typing("   → Loading dashboard...", 0.02)
-    time.sleep(0.5)
+    pause(0.5)
     
     print("\n2️⃣  Creating new scan...")
     simulate_typing("   → Target: example.com", 0.02)
     simulate_typing("   → Scan type: Comprehensive (Nmap + ZAP)", 0.02)
     simulate_typing("   → Initiating scan...", 0.02)
-    time.sleep(0.5)
+    pause(0.5)
     
     print("\n3️⃣  Scan in progress...")
     for i in range(5):
         print(f"   [{'='*i}{' '*(4-i)}] {(i+1)*20}%", end='\r')
-        time.sleep(0.3)
+        pause(0.3)
     print(f"   [{'='*5}] 100% - Complete!")
-    time.sleep(0.5)
+    pause(0.5)
     
     print("\n4️⃣  Processing results...")
     simulate_typing("   → 15 findings detected", 0.02)
     simulate_typing("   → 2 CRITICAL, 5 HIGH, 8 MEDIUM", 0.02)
     simulate_typing("   → Enriching with CVE data...", 0.02)
     simulate_typing("   → Mapping to MITRE ATT&CK...", 0.02)
-    time.sleep(0.5)
+    pause(0.5)
     
     print("\n5️⃣  Sending notifications...")
     simulate_typing("   ✓ Email sent to security@example.com", 0.02)
     simulate_typing("   ✓ Slack notification posted to #security-alerts", 0.02)
     simulate_typing("   ✓ PagerDuty incident created for CRITICAL findings", 0.02)
-    time.sleep(0.5)
+    pause(0.5)
     
     print("\n6️⃣  Generating report...")
     simulate_typing("   → Creating PDF report...", 0.02)
     simulate_typing("   → Including executive summary...", 0.02)
     simulate_typing("   → Adding technical details...", 0.02)
     simulate_typing("   ✓ Report ready for download", 0.02)
-    time.sleep(1)
+    pause(1)
     
     print(f"\n{Colors.GREEN}{Colors.BOLD}✓ Scan complete! Team notified, report generated.{Colors.END}\n")
-    time.sleep(2)
+    pause(2)
 
 
-def main():
+def parse_args(argv=None):
+    """Parse command-line options"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="CyperSecurity platform demo")
+    parser.add_argument(
+        "-y", "--non-interactive",
+        action="store_true",
+        help="don't wait for Enter between sections",
+    )
+    parser.add_argument(
+        "--pace",
+        type=float,
+        default=1.0,
+        help="scale all pauses and typing delays (0 runs instantly)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Run complete demo"""
+    global PACE, INTERACTIVE
+
+    args = parse_args(argv)
+    PACE = max(args.pace, 0.0)
+    INTERACTIVE = not args.non_interactive
+
     try:
         # Introduction
         demo_introduction()
-        input(f"\n{Colors.YELLOW}Press Enter to start feature walkthrough...{Colors.END} ")
+        wait_for_user("Press Enter to start feature walkthrough...")
         
         # Core features
         demo_core_features()
-        time.sleep(1)
+        pause(1)
         
         # Intelligence
         demo_intelligence()
-        time.sleep(1)
+        pause(1)
         
         # Billing
         demo_billing()
-        time.sleep(1)
+        pause(1)
         
         # Integrations
         demo_integrations()
-        time.sleep(1)
+        pause(1)
         
         # Quality
         demo_quality()
-        time.sleep(1)
+        pause(1)
         
         # Analytics
         demo_analytics()
-        time.sleep(1)
+        pause(1)
         
         # Documentation
         demo_documentation()
-        time.sleep(1)
+        pause(1)
         
         # Live example
-        input(f"\n{Colors.YELLOW}Press Enter to see live platform demo...{Colors.END} ")
+        wait_for_user("Press Enter to see live platform demo...")
         demo_live_example()
         
         # Summary
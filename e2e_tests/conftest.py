@@ -8,6 +8,7 @@ Automatically handles:
 - Cleaning up after tests
 """
 
+import json
 import pytest
 import subprocess
 import time
@@ -15,6 +16,7 @@ import requests
 import os
 import signal
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Test configuration
@@ -23,6 +25,26 @@ FRONTEND_URL = "http://localhost:3000"
 BACKEND_HEALTH_URL = f"{BACKEND_URL}/health"
 FRONTEND_READY_TIMEOUT = 60  # seconds
 BACKEND_READY_TIMEOUT = 30  # seconds
+NPM_DEPS_STAMP = ".e2e-deps-stamp"  # Lock file mtime of the last install
+PLAYWRIGHT_CACHE_DIR = Path(__file__).parent.parent / ".playwright-cache"  # Browser profiles
+
+# Trackers and ad scripts the browser never needs to fetch during tests
+THIRD_PARTY_HOSTS = (
+    "googletagmanager.com",
+    "google-analytics.com",
+    "doubleclick.net",
+    "segment.io",
+    "recaptcha.net",
+)
+# Resolve them to nothing at the DNS layer. Unlike page.route(), this
+# leaves Chromium's HTTP cache enabled.
+CHROMIUM_ARGS = [
+    "--host-resolver-rules="
+    + ", ".join(f"MAP {host} ~NOTFOUND, MAP *.{host} ~NOTFOUND" for host in THIRD_PARTY_HOSTS)
+]
+
+# pytest-xdist worker id ("gw0", "gw1", ...), None when running serially
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
 
 
 class ServiceManager:
@@ -32,9 +54,16 @@ class ServiceManager:
         self.backend_process = None
         self.frontend_process = None
         self.project_root = Path(__file__).parent.parent
+        self._stopped = False
+        self._probe = requests.Session()  # Reused across readiness polls
     
     def start_backend(self):
         """Start the Python backend"""
+        self._launch_backend()
+        self._await_backend()
+    
+    def _launch_backend(self):
+        """Spawn the backend process without waiting for it"""
         print("\n🚀 Starting backend...")
         
         brain_dir = self.project_root / "brain"
@@ -44,12 +73,13 @@ class ServiceManager:
         self.backend_process = subprocess.Popen(
             [str(venv_python), "-m", "uvicorn", "cyper_brain.main:app", "--reload", "--port", "8000"],
             cwd=str(brain_dir),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,  # Never read; a full pipe would stall the server
+            stderr=subprocess.DEVNULL,
             preexec_fn=os.setsid  # Create new process group
         )
-        
-        # Wait for backend to be ready
+    
+    def _await_backend(self):
+        """Block until the backend answers its health check"""
         ready = self._wait_for_service(BACKEND_HEALTH_URL, BACKEND_READY_TIMEOUT)
         if not ready:
             self.stop_backend()
@@ -59,26 +89,57 @@ class ServiceManager:
     
     def start_frontend(self):
         """Start the React frontend"""
+        self._launch_frontend()
+        self._await_frontend()
+    
+    def _launch_frontend(self):
+        """Spawn the frontend dev server without waiting for it"""
         print("\n🚀 Starting frontend...")
         
         dashboard_dir = self.project_root / "dashboard"
         
-        # Check if node_modules exists
-        if not (dashboard_dir / "node_modules").exists():
-            print("📦 Installing npm dependencies...")
-            subprocess.run(["npm", "install"], cwd=str(dashboard_dir), check=True)
+        self._ensure_npm_dependencies(dashboard_dir)
         
         # Start frontend process
         self.frontend_process = subprocess.Popen(
             ["npm", "start"],
             cwd=str(dashboard_dir),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             preexec_fn=os.setsid,
             env={**os.environ, "BROWSER": "none"}  # Don't auto-open browser
         )
+    
+    def _ensure_npm_dependencies(self, dashboard_dir: Path):
+        """
+        Install npm dependencies only when package-lock.json has changed
         
-        # Wait for frontend to be ready
+        The lock file's mtime is recorded in a stamp inside node_modules after
+        each install, so a fresh tree costs two stats and a missing or stale
+        one is rebuilt with ``npm ci``.
+        """
+        lock_file = dashboard_dir / "package-lock.json"
+        stamp_file = dashboard_dir / "node_modules" / NPM_DEPS_STAMP
+        
+        try:
+            lock_mtime = str(lock_file.stat().st_mtime_ns)
+        except FileNotFoundError:
+            lock_mtime = None
+        
+        try:
+            if lock_mtime is not None and stamp_file.read_text() == lock_mtime:
+                return
+        except FileNotFoundError:
+            pass
+        
+        print("📦 Installing npm dependencies...")
+        command = ["npm", "ci"] if lock_mtime is not None else ["npm", "install"]
+        subprocess.run(command, cwd=str(dashboard_dir), check=True)
+        if lock_mtime is not None:
+            stamp_file.write_text(lock_mtime)
+    
+    def _await_frontend(self):
+        """Block until the frontend dev server responds"""
         ready = self._wait_for_service(FRONTEND_URL, FRONTEND_READY_TIMEOUT)
         if not ready:
             self.stop_frontend()
@@ -86,8 +147,31 @@ class ServiceManager:
         
         print("✅ Frontend ready!")
     
-    def stop_backend(self):
-        """Stop the backend process"""
+    def start_all(self):
+        """
+        Start backend and frontend together
+        
+        Both processes are spawned up front and their readiness polls run
+        concurrently, so setup takes as long as the slower service rather
+        than the sum of both.
+        """
+        self._launch_backend()
+        self._launch_frontend()
+        
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(self._await_backend), pool.submit(self._await_frontend)]
+        
+        for future in futures:
+            future.result()  # Re-raise the first startup failure
+    
+    def stop_backend(self) -> bool:
+        """
+        Stop the backend process
+        
+        Returns:
+            True if the process exited on SIGTERM (or was never running)
+        """
+        graceful = True
         if self.backend_process:
             print("\n🛑 Stopping backend...")
             try:
@@ -97,14 +181,17 @@ class ServiceManager:
                     self.backend_process.wait(timeout=5)
                     print("✅ Backend stopped gracefully")
                 except subprocess.TimeoutExpired:
+                    graceful = False
                     print("⚠️  Backend didn't stop gracefully, forcing...")
                     # Force kill if graceful shutdown failed
                     os.killpg(os.getpgid(self.backend_process.pid), signal.SIGKILL)
                     self.backend_process.wait(timeout=2)
                     print("✅ Backend force-stopped")
             except ProcessLookupError:
+                graceful = False
                 print("ℹ️  Backend process already terminated")
             except Exception as e:
+                graceful = False
                 print(f"⚠️  Error stopping backend: {e}")
                 try:
                     # Last resort: force kill
@@ -113,9 +200,16 @@ class ServiceManager:
                     pass
             finally:
                 self.backend_process = None
+        return graceful
     
-    def stop_frontend(self):
-        """Stop the frontend process"""
+    def stop_frontend(self) -> bool:
+        """
+        Stop the frontend process
+        
+        Returns:
+            True if the process exited on SIGTERM (or was never running)
+        """
+        graceful = True
         if self.frontend_process:
             print("\n🛑 Stopping frontend...")
             try:
@@ -125,14 +219,17 @@ class ServiceManager:
                     self.frontend_process.wait(timeout=5)
                     print("✅ Frontend stopped gracefully")
                 except subprocess.TimeoutExpired:
+                    graceful = False
                     print("⚠️  Frontend didn't stop gracefully, forcing...")
                     # Force kill if graceful shutdown failed
                     os.killpg(os.getpgid(self.frontend_process.pid), signal.SIGKILL)
                     self.frontend_process.wait(timeout=2)
                     print("✅ Frontend force-stopped")
             except ProcessLookupError:
+                graceful = False
                 print("ℹ️  Frontend process already terminated")
             except Exception as e:
+                graceful = False
                 print(f"⚠️  Error stopping frontend: {e}")
                 try:
                     # Last resort: force kill
@@ -141,85 +238,107 @@ class ServiceManager:
                     pass
             finally:
                 self.frontend_process = None
+        return graceful
     
     def stop_all(self):
         """Stop all services - guaranteed cleanup"""
+        if self._stopped:
+            return
+        
         print("\n" + "="*80)
         print("🧹 Cleaning up all services...")
         print("="*80)
         
-        # Stop in reverse order of startup
-        self.stop_frontend()
-        self.stop_backend()
+        # Stop both at once so their graceful-shutdown windows overlap
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            stops = [pool.submit(self.stop_frontend), pool.submit(self.stop_backend)]
         
-        # Double-check: kill any remaining child processes
-        self._kill_orphaned_processes()
+        # Only scan for leftovers on our ports if a shutdown went wrong
+        if not all(stop.result() for stop in stops):
+            self._kill_orphaned_processes()
         
+        self._stopped = True
         print("✅ All services stopped!")
     
     def _kill_orphaned_processes(self):
         """Kill any orphaned Node.js or Python processes on our ports"""
+        ports = {3000, 8000}
         try:
             import psutil
             
-            # Kill processes on our ports
-            for port in [3000, 8000]:
-                for proc in psutil.process_iter(['pid', 'name', 'connections']):
-                    try:
-                        for conn in proc.connections():
-                            if conn.laddr.port == port:
-                                print(f"🔪 Killing orphaned process {proc.name()} (PID: {proc.pid}) on port {port}")
-                                proc.kill()
-                                proc.wait(timeout=2)
-                    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.TimeoutExpired):
-                        pass
+            # One walk of the kernel socket table instead of per-process lookups
+            victims = {
+                conn.pid: conn.laddr.port
+                for conn in psutil.net_connections(kind="inet")
+                if conn.pid and conn.laddr and conn.laddr.port in ports
+            }
+            for pid, port in victims.items():
+                try:
+                    proc = psutil.Process(pid)
+                    print(f"🔪 Killing orphaned process {proc.name()} (PID: {pid}) on port {port}")
+                    proc.kill()
+                    proc.wait(timeout=2)
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.TimeoutExpired):
+                    pass
         except ImportError:
             # psutil not available, try lsof instead
             try:
-                for port in [3000, 8000]:
-                    result = subprocess.run(
-                        ["lsof", "-ti", f":{port}"],
-                        capture_output=True,
-                        text=True
-                    )
-                    if result.stdout.strip():
-                        pids = result.stdout.strip().split('\n')
-                        for pid in pids:
-                            try:
-                                subprocess.run(["kill", "-9", pid])
-                                print(f"🔪 Killed orphaned process PID {pid} on port {port}")
-                            except:
-                                pass
+                lsof_args = ["lsof", "-t"]
+                for port in sorted(ports):
+                    lsof_args += ["-i", f":{port}"]
+                result = subprocess.run(
+                    lsof_args,
+                    capture_output=True,
+                    text=True
+                )
+                for pid in set(result.stdout.split()):
+                    try:
+                        os.kill(int(pid), signal.SIGKILL)
+                        print(f"🔪 Killed orphaned process PID {pid}")
+                    except (ProcessLookupError, PermissionError, ValueError):
+                        pass
             except FileNotFoundError:
                 pass  # lsof not available
     
     def _wait_for_service(self, url: str, timeout: int) -> bool:
         """Wait for a service to be ready"""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        deadline = time.monotonic() + timeout
+        use_head = True
+        attempt = 0
+        while time.monotonic() < deadline:
             try:
-                response = requests.get(url, timeout=2)
+                if use_head:
+                    response = self._probe.head(url, timeout=1, allow_redirects=False)
+                    if response.status_code in (405, 501):
+                        # Endpoint doesn't do HEAD; switch to GET for good
+                        use_head = False
+                        response = self._probe.get(url, timeout=1)
+                else:
+                    response = self._probe.get(url, timeout=1)
                 if response.status_code == 200:
                     return True
             except requests.exceptions.RequestException:
                 pass
-            time.sleep(1)
+            time.sleep(min(0.25 * 2 ** attempt, 1.0))
+            attempt += 1
             print(".", end="", flush=True)
         return False
 
 
 # Global service manager instance
 _service_manager = None
+_cleanup_done = False
 
 
 def _emergency_cleanup(signum=None, frame=None):
     """Emergency cleanup handler for signals (Ctrl+C, kill, etc.)"""
-    global _service_manager
+    global _service_manager, _cleanup_done
     
     if signum:
         print(f"\n\n⚠️  Received signal {signum} - Emergency cleanup!")
     
-    if _service_manager:
+    if _service_manager and not _cleanup_done:
+        _cleanup_done = True
         try:
             _service_manager.stop_all()
         except Exception as e:
@@ -252,9 +371,15 @@ def pytest_configure(config):
     - KeyboardInterrupt (Ctrl+C)
     - Process termination (kill)
     - Python exit
+    
+    Under pytest-xdist only the controller process manages services;
+    workers just connect to them.
     """
     global _service_manager
     
+    if hasattr(config, "workerinput"):
+        return
+    
     print("\n" + "="*80)
     print("🧪 E2E Test Suite - Environment Setup")
     print("="*80)
@@ -266,8 +391,7 @@ def pytest_configure(config):
     
     try:
         # Start services
-        _service_manager.start_backend()
-        _service_manager.start_frontend()
+        _service_manager.start_all()
         
         print("\n" + "="*80)
         print("✅ All services ready! Starting tests...")
@@ -290,6 +414,8 @@ def pytest_unconfigure(config):
     Called once after all tests
     Stop backend and frontend services
     
+    Under pytest-xdist this only does work in the controller process.
+    
     This is the primary cleanup - but we have backups:
     - atexit handler (if this fails)
     - signal handlers (if interrupted)
@@ -326,25 +452,43 @@ def frontend_base_url():
 
 @pytest.fixture(scope="session")
 def test_user_data():
-    """Test user credentials"""
+    """Test user credentials, namespaced per xdist worker"""
+    email = f"test+{XDIST_WORKER}@example.com" if XDIST_WORKER else "test@example.com"
     return {
-        "email": "test@example.com",
+        "email": email,
         "password": "SecurePass123!",
         "name": "Test User"
     }
 
 
 @pytest.fixture(scope="session", autouse=True)
-def seed_test_data(api_base_url, test_user_data):
+def backend_available():
+    """
+    Skip the suite straight away when the backend isn't answering
+    
+    Saves every seeding call and API fixture from running into its own
+    timeout one after another.
+    """
+    try:
+        requests.get(BACKEND_HEALTH_URL, timeout=0.5).raise_for_status()
+    except requests.exceptions.RequestException as e:
+        pytest.skip(f"backend not running at {BACKEND_URL}: {e}")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def seed_test_data(backend_available, api_base_url, test_user_data):
     """
     Seed database with test data
     Runs once before all tests
     """
     print("\n📊 Seeding test data...")
     
+    # One keep-alive session for the whole seeding sequence
+    session = requests.Session()
+    
     try:
         # Create test user
-        response = requests.post(
+        response = session.post(
             f"{api_base_url}/api/auth/signup",
             json=test_user_data
         )
@@ -358,7 +502,7 @@ def seed_test_data(api_base_url, test_user_data):
         
         # Create test organization
         # Login first to get token
-        login_response = requests.post(
+        login_response = session.post(
             f"{api_base_url}/api/auth/login",
             json={
                 "email": test_user_data["email"],
@@ -368,29 +512,32 @@ def seed_test_data(api_base_url, test_user_data):
         
         if login_response.status_code == 200:
             token = login_response.json().get("access_token")
-            headers = {"Authorization": f"Bearer {token}"}
+            session.headers["Authorization"] = f"Bearer {token}"
             
             # Create organization
-            org_response = requests.post(
+            org_response = session.post(
                 f"{api_base_url}/api/organizations",
                 json={
-                    "name": "Test Security Corp",
+                    "name": f"Test Security Corp {XDIST_WORKER}" if XDIST_WORKER else "Test Security Corp",
                     "industry": "technology",
                     "size": "11-50"
-                },
-                headers=headers
+                }
             )
             
             if org_response.status_code in [200, 201]:
                 print("✅ Test organization created")
             elif org_response.status_code == 409:
                 print("ℹ️  Test organization already exists")
+        else:
+            print(f"⚠️  Login returned: {login_response.status_code}")
         
         print("✅ Test data seeding complete")
         
     except Exception as e:
         print(f"⚠️  Warning: Could not seed all test data: {e}")
         print("   Tests will attempt to create data as needed")
+    finally:
+        session.close()
     
     yield  # Tests run here
     
@@ -404,23 +551,73 @@ def seed_test_data(api_base_url, test_user_data):
         pass
 
 
+@pytest.fixture(scope="session")
+def auth_token(api_base_url, test_user_data):
+    """Access token for the test user, from a single API login"""
+    with requests.Session() as session:
+        response = session.post(
+            f"{api_base_url}/api/auth/login",
+            json={
+                "email": test_user_data["email"],
+                "password": test_user_data["password"]
+            },
+            timeout=10
+        )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+@pytest.fixture(scope="session")
+def playwright_driver():
+    """Playwright driver shared by every browser fixture in the session"""
+    from playwright.sync_api import sync_playwright
+    
+    with sync_playwright() as p:
+        yield p
+
+
+@pytest.fixture(scope="session")
+def browser(playwright_driver):
+    """Throwaway browser for tests that need a clean, logged-out context"""
+    browser = playwright_driver.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+    yield browser
+    browser.close()
+
+
+@pytest.fixture(scope="session")
+def browser_context(playwright_driver, frontend_base_url, auth_token):
+    """
+    Logged-in browser context backed by an on-disk profile
+    
+    The profile under PLAYWRIGHT_CACHE_DIR keeps Chromium's HTTP and code
+    caches between runs, so repeat runs load the dashboard warm. Each xdist
+    worker gets its own profile, since Chromium locks the directory.
+    
+    The init script below writes the token back on every navigation, so a
+    logout never sticks in this context. Tests that exercise logout need a
+    fresh context from ``browser`` instead.
+    """
+    user_data_dir = PLAYWRIGHT_CACHE_DIR / (XDIST_WORKER or "main")
+    context = playwright_driver.chromium.launch_persistent_context(
+        user_data_dir=str(user_data_dir),
+        headless=True,
+        args=CHROMIUM_ARGS
+    )
+    # Persistent contexts can't take storage_state, so seed the token on load
+    context.add_init_script(
+        f"if (window.location.origin === {json.dumps(frontend_base_url)}) "
+        f"window.localStorage.setItem('auth_token', {json.dumps(auth_token)});"
+    )
+    yield context
+    context.close()
+
+
 @pytest.fixture
-def authenticated_page(page, frontend_base_url, test_user_data):
+def authenticated_page(browser_context):
     """
     Returns an authenticated page session
-    Logs in the test user before each test
+    Opened in the shared logged-in browser_context
     """
-    # Navigate to login
-    page.goto(f"{frontend_base_url}/login")
-    
-    # Fill login form
-    page.fill('input[name="email"]', test_user_data["email"])
-    page.fill('input[name="password"]', test_user_data["password"])
-    
-    # Submit
-    page.click('button[type="submit"]')
-    
-    # Wait for redirect to dashboard
-    page.wait_for_url(f"{frontend_base_url}/dashboard", timeout=10000)
-    
-    return page
+    page = browser_context.new_page()
+    yield page
+    page.close()
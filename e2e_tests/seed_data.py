@@ -5,9 +5,66 @@ Creates initial test data in the database for E2E tests.
 Can be run standalone or used by conftest.py
 """
 
+import logging
+import os
 import requests
 import sys
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Final
+
+logger = logging.getLogger(__name__)
+
+# orjson encodes payloads several times faster than json
+try:
+    from orjson import dumps as _dumps
+except ImportError:
+    import json
+    
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+# Parallel pytest-xdist workers each get their own user and org
+_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+
+# Test user
+_USER_DATA: Final[dict] = {
+    "email": f"test+{_WORKER}@example.com" if _WORKER else "test@example.com",
+    "password": "SecurePass123!",
+    "name": "Test User"
+}
+
+# Organization
+_ORG_DATA: Final[dict] = {
+    "name": f"Test Security Corp {_WORKER}" if _WORKER else "Test Security Corp",
+    "industry": "technology",
+    "size": "11-50"
+}
+
+# Sample scan with results
+_SCAN_DATA: Final[dict] = {
+    "target": "scanme.nmap.org",
+    "scan_type": "nmap",
+    "status": "completed",
+    "results": {
+        "ports": [
+            {"port": 22, "state": "open", "service": "ssh"},
+            {"port": 80, "state": "open", "service": "http"},
+        ],
+        "vulnerabilities": [
+            {
+                "title": "Outdated SSH Version",
+                "severity": "medium",
+                "cvss_score": 5.3,
+                "description": "SSH server running outdated version"
+            }
+        ]
+    }
+}
+
+
+# Body for the backend's bulk seeding endpoint, encoded once
+_BULK_SEED_JSON: Final[bytes] = _dumps({"user": _USER_DATA, "org": _ORG_DATA, "scan": _SCAN_DATA})
 
 
 class TestDataSeeder:
@@ -16,34 +73,43 @@ class TestDataSeeder:
     def __init__(self, api_base_url: str = "http://localhost:8000"):
         self.api_base_url = api_base_url
         self.token = None
+        
+        # One keep-alive connection pool shared by every seeding call
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Bodies are sent pre-encoded as data=, so declare the type once here
+        self.session.headers["Content-Type"] = "application/json"
     
     def create_test_user(self, user_data: Dict[str, str]) -> bool:
         """Create a test user"""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base_url}/api/auth/signup",
-                json=user_data,
-                timeout=5
+                data=_dumps(user_data),
+                timeout=3
             )
             return response.status_code in [200, 201, 409]  # 409 = already exists
         except Exception as e:
-            print(f"Error creating user: {e}")
+            logger.error("Error creating user: %s", e)
             return False
     
     def login_test_user(self, email: str, password: str) -> bool:
         """Login and get auth token"""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base_url}/api/auth/login",
-                json={"email": email, "password": password},
-                timeout=5
+                data=_dumps({"email": email, "password": password}),
+                timeout=3
             )
             if response.status_code == 200:
                 self.token = response.json().get("access_token")
+                self.session.headers["Authorization"] = f"Bearer {self.token}"
                 return True
             return False
         except Exception as e:
-            print(f"Error logging in: {e}")
+            logger.error("Error logging in: %s", e)
             return False
     
     def create_test_organization(self, org_data: Dict[str, str]) -> bool:
@@ -52,95 +118,122 @@ class TestDataSeeder:
             return False
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base_url}/api/organizations",
-                json=org_data,
-                headers={"Authorization": f"Bearer {self.token}"},
-                timeout=5
+                data=_dumps(org_data),
+                timeout=3
             )
             return response.status_code in [200, 201, 409]
         except Exception as e:
-            print(f"Error creating organization: {e}")
+            logger.error("Error creating organization: %s", e)
             return False
     
+    def _scan_exists(self, scan_data: Dict[str, Any]) -> bool:
+        """Check whether a matching scan was seeded by an earlier run"""
+        try:
+            response = self.session.get(
+                f"{self.api_base_url}/api/scans",
+                params={
+                    "status": scan_data["status"],
+                    "scan_type": scan_data["scan_type"],
+                    "limit": 100
+                },
+                timeout=2
+            )
+            if response.status_code != 200:
+                return False
+            for scan in response.json().get("scans", []):
+                target = scan.get("target")
+                if isinstance(target, dict):
+                    target = target.get("value")
+                if target == scan_data["target"]:
+                    return True
+        except Exception:
+            pass
+        return False
+    
     def create_test_scan(self, scan_data: Dict[str, Any]) -> bool:
         """Create a completed test scan with results"""
         if not self.token:
             return False
         
+        # A cheap list lookup beats a full create that ends in 409
+        if self._scan_exists(scan_data):
+            return True
+        
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base_url}/api/scans",
-                json=scan_data,
-                headers={"Authorization": f"Bearer {self.token}"},
-                timeout=5
+                data=_dumps(scan_data),
+                timeout=3
             )
             return response.status_code in [200, 201, 409]
         except Exception as e:
-            print(f"Error creating scan: {e}")
+            logger.error("Error creating scan: %s", e)
+            return False
+    
+    def bulk_seed(self) -> bool:
+        """
+        Seed user, organization and scan in one request
+        
+        Returns:
+            True if the bulk endpoint seeded everything; False if it is
+            unavailable or refused the request (missing route, auth,
+            validation, network error) and per-entity seeding should run
+        """
+        try:
+            response = self.session.post(
+                f"{self.api_base_url}/api/test/bulk-seed",
+                data=_BULK_SEED_JSON,
+                timeout=10
+            )
+        except Exception as e:
+            logger.info("Bulk seeding unavailable (%s), seeding piecemeal", e)
             return False
+        
+        return response.status_code in [200, 201, 409]
     
     def seed_all(self) -> bool:
         """Seed all test data"""
-        print("🌱 Seeding test data...")
+        logger.info("🌱 Seeding test data...")
         
-        # Test user
-        user_data = {
-            "email": "test@example.com",
-            "password": "SecurePass123!",
-            "name": "Test User"
-        }
+        # One round-trip when the backend exposes the bulk endpoint
+        if self.bulk_seed():
+            logger.info("✅ All test data seeded successfully!")
+            return True
         
-        if not self.create_test_user(user_data):
-            print("❌ Failed to create test user")
-            return False
-        print("✅ Test user created/verified")
-        
-        # Login
-        if not self.login_test_user(user_data["email"], user_data["password"]):
-            print("❌ Failed to login test user")
-            return False
-        print("✅ Logged in as test user")
+        # Try logging in first: on a re-seed the user already exists and
+        # the signup round-trip (and its 409) can be skipped
+        if self.login_test_user(_USER_DATA["email"], _USER_DATA["password"]):
+            logger.info("✅ Test user already exists")
+        else:
+            if not self.create_test_user(_USER_DATA):
+                logger.error("❌ Failed to create test user")
+                return False
+            logger.info("✅ Test user created/verified")
+            
+            # Login
+            if not self.login_test_user(_USER_DATA["email"], _USER_DATA["password"]):
+                logger.error("❌ Failed to login test user")
+                return False
+        logger.info("✅ Logged in as test user")
         
-        # Organization
-        org_data = {
-            "name": "Test Security Corp",
-            "industry": "technology",
-            "size": "11-50"
-        }
+        # Both only need the auth token, so create them concurrently
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            org_created = pool.submit(self.create_test_organization, _ORG_DATA)
+            scan_created = pool.submit(self.create_test_scan, _SCAN_DATA)
         
-        if not self.create_test_organization(org_data):
-            print("❌ Failed to create test organization")
+        if not org_created.result():
+            logger.error("❌ Failed to create test organization")
             return False
-        print("✅ Test organization created/verified")
+        logger.info("✅ Test organization created/verified")
         
-        # Sample scan with results
-        scan_data = {
-            "target": "scanme.nmap.org",
-            "scan_type": "nmap",
-            "status": "completed",
-            "results": {
-                "ports": [
-                    {"port": 22, "state": "open", "service": "ssh"},
-                    {"port": 80, "state": "open", "service": "http"},
-                ],
-                "vulnerabilities": [
-                    {
-                        "title": "Outdated SSH Version",
-                        "severity": "medium",
-                        "cvss_score": 5.3,
-                        "description": "SSH server running outdated version"
-                    }
-                ]
-            }
-        }
-        
-        if not self.create_test_scan(scan_data):
-            print("⚠️  Could not create test scan (may not be critical)")
+        if not scan_created.result():
+            logger.warning("⚠️  Could not create test scan (may not be critical)")
         else:
-            print("✅ Test scan created/verified")
+            logger.info("✅ Test scan created/verified")
         
-        print("✅ All test data seeded successfully!")
+        logger.info("✅ All test data seeded successfully!")
         return True
 
 
@@ -157,6 +250,8 @@ def main():
     
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     seeder = TestDataSeeder(args.api_url)
     success = seeder.seed_all()
     
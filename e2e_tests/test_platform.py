@@ -6,17 +6,45 @@ Tests complete user workflows using Playwright.
 
 import pytest
 from playwright.sync_api import Page, expect
+import requests
 import time
 import re
 
 
+SCAN_TIMEOUT = 180  # seconds
+SCAN_POLL_INTERVAL = 2  # seconds
+
+
+def wait_for_scan(api_base_url: str, token: str, scan_id: str, timeout: float = SCAN_TIMEOUT) -> str:
+    """
+    Poll the scan API until the scan leaves pending/running
+    
+    Returns:
+        The final scan status (or the last one seen if the timeout expired)
+    """
+    deadline = time.monotonic() + timeout
+    status = None
+    with requests.Session() as session:
+        session.headers["Authorization"] = f"Bearer {token}"
+        while time.monotonic() < deadline:
+            response = session.get(f"{api_base_url}/api/scans/{scan_id}", timeout=5)
+            if response.status_code == 200:
+                status = response.json().get("status")
+                if status not in ("pending", "running"):
+                    return status
+            time.sleep(SCAN_POLL_INTERVAL)
+    return status
+
+
 class TestUserOnboarding:
     """Test complete user onboarding flow"""
     
-    def test_signup_and_verification(self, page: Page, frontend_base_url):
+    def test_signup_and_verification(self, anonymous_page: Page, frontend_base_url):
         """Test user can sign up and verify email"""
+        page = anonymous_page
+        
         # Navigate to signup page
-        page.goto(f"{frontend_base_url}/signup")
+        page.goto(f"{frontend_base_url}/signup", wait_until="domcontentloaded")
         
         # Fill signup form
         page.fill('input[name="email"]', "test@example.com")
@@ -37,7 +65,7 @@ class TestUserOnboarding:
     def test_onboarding_wizard(self, authenticated_page: Page, frontend_base_url):
         """Test 4-step onboarding wizard"""
         # User is already logged in via fixture
-        authenticated_page.goto(f"{frontend_base_url}/onboarding")
+        authenticated_page.goto(f"{frontend_base_url}/onboarding", wait_until="domcontentloaded")
         
         # Step 1: Welcome
         expect(page.locator('h1:has-text("Welcome")')).to_be_visible()
@@ -65,10 +93,16 @@ class TestUserOnboarding:
 class TestScanWorkflow:
     """Test complete scan workflow"""
     
-    def test_create_and_run_nmap_scan(self, authenticated_page: Page, frontend_base_url):
+    @pytest.mark.slow
+    @pytest.mark.xdist_group("nmap")
+    def test_create_and_run_nmap_scan(
+        self, authenticated_page: Page, frontend_base_url, api_base_url, auth_token
+    ):
         """Test creating and running Nmap scan"""
+        page = authenticated_page
+        
         # Navigate to dashboard
-        authenticated_page.goto(f"{frontend_base_url}/dashboard")
+        page.goto(f"{frontend_base_url}/dashboard", wait_until="domcontentloaded")
         
         # Click New Scan
         page.click('button:has-text("New Scan")')
@@ -81,23 +115,30 @@ class TestScanWorkflow:
         page.select_option('select[name="scan_type"]', "quick")
         page.check('input[name="service_detection"]')
         
-        # Start scan
-        page.click('button:has-text("Start Scan")')
+        # Start scan, keeping the id the API hands back
+        with page.expect_response(
+            lambda r: "/api/scans" in r.url and r.request.method == "POST"
+        ) as scan_response:
+            page.click('button:has-text("Start Scan")')
+        scan_id = scan_response.value.json()["scan_id"]
         
         # Should see scan in progress
         expect(page.locator('text=Scanning')).to_be_visible()
         
-        # Wait for completion (with timeout)
-        page.wait_for_selector('text=Completed', timeout=180000)  # 3 min
+        # Wait for completion on the API rather than the DOM, then render once
+        assert wait_for_scan(api_base_url, auth_token, scan_id) == "completed"
+        page.reload(wait_until="domcontentloaded")
+        expect(page.locator('text=Completed')).to_be_visible()
         
         # Should see results
         expect(page.locator('text=Open Ports')).to_be_visible()
         expect(page.locator('text=Services')).to_be_visible()
     
+    @pytest.mark.slow
     def test_generate_pdf_report(self, page: Page):
         """Test PDF report generation"""
         # Navigate to completed scan
-        page.goto("http://localhost:3000/scans/scan_12345")
+        page.goto("http://localhost:3000/scans/scan_12345", wait_until="domcontentloaded")
         
         # Click generate report
         page.click('button:has-text("Generate Report")')
@@ -111,9 +152,10 @@ class TestScanWorkflow:
         # Wait for generation
         expect(page.locator('text=Generating')).to_be_visible()
         
+        download_button = page.locator('button:has-text("Download")')
         with page.expect_download() as download_info:
-            page.wait_for_selector('button:has-text("Download")', timeout=60000)
-            page.click('button:has-text("Download")')
+            download_button.wait_for(timeout=60000)
+            download_button.click()
         
         download = download_info.value
         assert download.suggested_filename.endswith('.pdf')
@@ -125,7 +167,7 @@ class TestIntegrations:
     def test_slack_integration_setup(self, page: Page):
         """Test Slack integration setup"""
         # Navigate to integrations
-        page.goto("http://localhost:3000/settings/integrations")
+        page.goto("http://localhost:3000/settings/integrations", wait_until="domcontentloaded")
         
         # Find Slack card
         slack_card = page.locator('div:has-text("Slack")').first
@@ -138,23 +180,35 @@ class TestIntegrations:
         # For testing, might use mock OAuth
         expect(page.locator('text=Connect to Slack')).to_be_visible()
     
-    def test_webhook_creation(self, page: Page):
+    def test_webhook_creation(self, page: Page, api_base_url, auth_token):
         """Test webhook creation"""
-        page.goto("http://localhost:3000/settings/integrations")
+        webhook_url = "https://example.com/webhook"
+        page.goto("http://localhost:3000/settings/integrations", wait_until="domcontentloaded")
         
         # Click Add Webhook
         page.click('button:has-text("Add Webhook")')
         
         # Fill form
-        page.fill('input[name="url"]', "https://example.com/webhook")
+        page.fill('input[name="url"]', webhook_url)
         page.check('input[value="scan.completed"]')
         page.check('input[value="critical.finding"]')
         
-        # Save
-        page.click('button:has-text("Save")')
-        
-        # Should see webhook in list
-        expect(page.locator('text=https://example.com/webhook')).to_be_visible()
+        # Save, waiting for the create call so the check below can't race it
+        with page.expect_response(
+            lambda r: "/api/webhooks" in r.url and r.request.method == "POST"
+        ):
+            page.click('button:has-text("Save")')
+        
+        # Webhook should be stored server-side; check the API, not the DOM
+        response = page.request.get(
+            f"{api_base_url}/api/webhooks",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        assert response.ok
+        webhooks = response.json()
+        if isinstance(webhooks, dict):
+            webhooks = webhooks.get("webhooks", [])
+        assert any(webhook.get("url") == webhook_url for webhook in webhooks)
 
 
 class TestBillingWorkflow:
@@ -162,7 +216,7 @@ class TestBillingWorkflow:
     
     def test_upgrade_to_pro_plan(self, page: Page):
         """Test upgrading to Pro plan"""
-        page.goto("http://localhost:3000/settings/billing")
+        page.goto("http://localhost:3000/settings/billing", wait_until="domcontentloaded")
         
         # Click upgrade
         page.click('button:has-text("Upgrade to Pro")')
@@ -189,7 +243,7 @@ class TestTeamCollaboration:
     
     def test_invite_team_member(self, page: Page):
         """Test inviting team member"""
-        page.goto("http://localhost:3000/settings/team")
+        page.goto("http://localhost:3000/settings/team", wait_until="domcontentloaded")
         
         # Click invite
         page.click('button:has-text("Invite Member")')
@@ -207,32 +261,21 @@ class TestTeamCollaboration:
 
 
 @pytest.fixture
-def page(browser):
+def page(browser_context):
     """Create page with authenticated user"""
-    context = browser.new_context()
-    page = context.new_page()
-    
-    # Login (or set auth token)
-    page.goto("http://localhost:3000/login")
-    page.fill('input[name="email"]', "test@example.com")
-    page.fill('input[name="password"]', "SecurePass123!")
-    page.click('button[type="submit"]')
-    
-    # Wait for redirect to dashboard
-    page.wait_for_url("**/dashboard")
+    page = browser_context.new_page()
     
     yield page
     
-    context.close()
+    page.close()
 
 
-# Pytest configuration
-@pytest.fixture(scope="session")
-def browser():
-    """Create browser instance"""
-    from playwright.sync_api import sync_playwright
+@pytest.fixture
+def anonymous_page(browser):
+    """Create page with no logged-in user"""
+    context = browser.new_context()
+    page = context.new_page()
+    
+    yield page
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        yield browser
-        browser.close()
+    context.close()
@@ -19,8 +19,15 @@ echo ""
 # Activate virtual environment
 source .venv/bin/activate
 
+# Set E2E_PARALLEL=1 to shard tests across CPUs with pytest-xdist.
+# loadgroup schedules each xdist_group (e.g. the long nmap scan) as one unit.
+PYTEST_ARGS=(-v --tb=short)
+if [ -n "$E2E_PARALLEL" ]; then
+    PYTEST_ARGS+=(-n auto --dist loadgroup)
+fi
+
 # Run pytest (conftest.py handles everything else)
-pytest e2e_tests/ -v --tb=short
+pytest e2e_tests/ "${PYTEST_ARGS[@]}"
 
 echo ""
 echo "✅ Tests complete! Services have been stopped."